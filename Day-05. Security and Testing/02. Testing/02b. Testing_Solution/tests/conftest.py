@@ -1,7 +1,8 @@
 import pytest
 from starlette.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 import sys
 import os
 
@@ -12,34 +13,54 @@ from database import get_db
 from models.base import BaseModel
 from tests.lib import seed_db
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# ! An in-memory database: every pytest process (each xdist worker too) gets its own,
+# ! and nothing is left behind on disk. StaticPool keeps the one connection alive, the
+# ! database only exists as long as it's open.
+SQLALCHEMY_DATABASE_URL = "sqlite://"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@pytest.fixture(scope="session")
+def engine():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
 
-BaseModel.metadata.create_all(bind=engine)
+    # ! pysqlite starts and ends transactions on its own, which breaks SAVEPOINT.
+    # ! Turn that off and let SQLAlchemy emit BEGIN itself.
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
 
-@pytest.fixture(scope="module")
-def test_app():
-    client = TestClient(app)
-    yield client
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
 
-@pytest.fixture(scope="module")
-def test_db() -> Session:
-    # drop all tables in the database
-    BaseModel.metadata.drop_all(bind=engine)
-    # create all tables in the database
+    # ! The schema and the seed data are built once for the whole run
     BaseModel.metadata.create_all(bind=engine)
-    # initiate a new session
-    db = TestingSessionLocal()
-    seed_db(db)
+    with Session(bind=engine) as db:
+        seed_db(db)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def test_db(engine) -> Session:
+    # ! Each test runs inside a transaction that's rolled back afterwards. The app's
+    # ! commits only release a SAVEPOINT inside it, so every test starts from the seed data.
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
     yield db
     db.close()
+    transaction.rollback()
+    connection.close()
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def override_get_db(test_db):
     def _get_db_override():
         return test_db
     app.dependency_overrides[get_db] = _get_db_override
     yield
-    app.dependency_overrides = {}
\ No newline at end of file
+    app.dependency_overrides = {}
+
+@pytest.fixture
+def test_app(override_get_db):
+    client = TestClient(app)
+    yield client
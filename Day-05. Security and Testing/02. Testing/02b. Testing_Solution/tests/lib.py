@@ -24,4 +24,9 @@ def login(test_app: TestClient, username: str):
     response = test_app.post("/api/login", json={"username": username})
     token = response.json()['token']
     headers = {"Authorization": f"Bearer {token}"}
-    return headers
\ No newline at end of file
+    return headers
+
+def create_tea(test_app: TestClient, headers: dict):
+    # Every test starts from the seed data, so a test that changes a tea makes its own first
+    response = test_app.post("/api/teas", headers=headers, json={"name": "Tea to change", "in_stock": True, "rating": 3})
+    return response.json()['id']
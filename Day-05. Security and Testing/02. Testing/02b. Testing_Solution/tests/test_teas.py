@@ -4,7 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from models.tea import TeaModel
-from tests.lib import login
+from tests.lib import login, create_tea
 from main import app
 
 def test_get_teas(test_app: TestClient, override_get_db):
@@ -98,6 +98,7 @@ def test_create_tea_not_logged_in(test_app: TestClient, test_db: Session):
 
 def test_update_tea(test_app: TestClient, test_db: Session):
     headers = login(test_app, 'ben')
+    tea_id = create_tea(test_app, headers)
 
     tea_data = {
         "name": "Test with name change!",
@@ -105,7 +106,7 @@ def test_update_tea(test_app: TestClient, test_db: Session):
         "rating": 4
     }
 
-    response = test_app.put("/api/teas/3", headers=headers, json=tea_data)
+    response = test_app.put(f"/api/teas/{tea_id}", headers=headers, json=tea_data)
 
     # Assert that the tea was updated
     assert response.status_code == 200
@@ -164,15 +165,16 @@ def test_update_not_found(test_app: TestClient, test_db: Session):
   
 def test_delete_tea(test_app: TestClient, test_db: Session):
     headers = login(test_app, 'ben')
+    tea_id = create_tea(test_app, headers)
 
-    response = test_app.delete("/api/teas/3", headers=headers)
+    response = test_app.delete(f"/api/teas/{tea_id}", headers=headers)
 
     # Assert that the tea was deleted
     assert response.status_code == 200
-    assert response.json() == {'message': 'Tea 3 deleted successfully'}
+    assert response.json() == {'message': f'Tea {tea_id} deleted successfully'}
 
     # Now, check if the tea is in the database:
-    tea = test_db.query(TeaModel).filter(TeaModel.id == 3).first()
+    tea = test_db.query(TeaModel).filter(TeaModel.id == tea_id).first()
 
     # Assert that the tea is None (meaning it was deleted from DB)
     assert tea is None
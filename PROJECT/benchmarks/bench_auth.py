@@ -0,0 +1,31 @@
+# benchmarks/bench_auth.py
+#
+#   python -m pytest benchmarks/bench_auth.py --benchmark-autosave
+
+import jwt
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from dependencies.get_current_user import get_current_user, token_cache
+from config.environment import secret
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_generate_token(benchmark, user):
+    assert benchmark(user.generate_token)
+
+def test_jwt_decode(benchmark, user):
+    token = user.generate_token()
+    payload = benchmark(jwt.decode, token, secret, algorithms=["HS256"])
+    assert payload["sub"] == user.id
+
+def test_get_current_user_uncached(benchmark, db, user):
+    # A token seen for the first time: decode it and look the user up
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=user.generate_token())
+    found = benchmark.pedantic(get_current_user, args=(db, credentials), setup=token_cache.clear, rounds=200)
+    assert found.id == user.id
+
+def test_get_current_user_cached(benchmark, db, user):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=user.generate_token())
+    get_current_user(db, credentials)
+    assert benchmark(get_current_user, db, credentials).id == user.id
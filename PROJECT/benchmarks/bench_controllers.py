@@ -0,0 +1,128 @@
+# benchmarks/bench_controllers.py
+#
+#   BENCH_RECIPES=10000 python -m pytest benchmarks/bench_controllers.py --benchmark-autosave
+#
+# Each controller function called directly with a session on the scaled catalogue,
+# the dependencies built by hand, so routing, validation of the request and the
+# response_model don't count.
+
+from itertools import count, cycle
+import pytest
+from sqlalchemy import select
+from controllers import recipes, ingredients, steps, tags
+from dependencies.fieldsets import recipe_fieldset
+from models.recipe import RecipeModel
+from serializers.recipe import RecipeSchema, RecipeCreate
+from serializers.ingredient import IngredientSchema
+from serializers.step import StepSchema, StepMove
+from cache.recipes import recipe_cache
+from benchmarks.lib import big_recipe, page, validators
+
+pytest.importorskip("pytest_benchmark")
+
+full = recipe_fieldset(None, None)
+
+
+def test_get_recipes(benchmark, db):
+    response = benchmark(lambda: recipes.get_recipes(None, db, page(20), validators(), full))
+    assert response.status_code == 200
+
+def test_get_recipes_sparse(benchmark, db):
+    fieldset = recipe_fieldset("title,serves", "user")
+    response = benchmark(lambda: recipes.get_recipes(None, db, page(20), validators(), fieldset))
+    assert response.status_code == 200
+
+def test_get_recipes_by_tag(benchmark, db):
+    response = benchmark(lambda: recipes.get_recipes("pasta", db, page(20), validators(), full))
+    assert response.status_code == 200
+
+def test_get_recipes_not_modified(benchmark, db):
+    first = validators()
+    recipes.get_recipes(None, db, page(20), first, full)
+    etag = first.headers["ETag"]
+    response = benchmark(lambda: recipes.get_recipes(None, db, page(20), validators(headers={"If-None-Match": etag}), full))
+    assert response.status_code == 304
+
+def test_get_single_recipe_uncached(benchmark, db):
+    response = benchmark.pedantic(lambda: recipes.get_single_recipe(1, db, validators("/api/recipes/1"), full),
+                                  setup=recipe_cache.clear, rounds=200)
+    assert response.headers["X-Cache"] == "MISS"
+
+def test_get_single_recipe_cached(benchmark, db):
+    recipes.get_single_recipe(1, db, validators("/api/recipes/1"), full)
+    response = benchmark(lambda: recipes.get_single_recipe(1, db, validators("/api/recipes/1"), full))
+    assert response.headers["X-Cache"] == "HIT"
+
+def test_search_recipes(benchmark, db):
+    assert benchmark(lambda: recipes.search_recipes("capers", db, page(20)))
+
+def test_get_ingredients(benchmark, db):
+    assert benchmark(lambda: ingredients.get_ingredients(db, page(50), validators("/api/ingredients"))).status_code == 200
+
+def test_get_single_ingredient(benchmark, db):
+    assert benchmark(lambda: ingredients.get_single_ingredient(1, db, validators("/api/ingredients/1"))).id == 1
+
+def test_get_steps(benchmark, db):
+    assert benchmark(lambda: steps.get_steps(db, page(50), validators("/api/steps"))).status_code == 200
+
+def test_get_tags(benchmark, db):
+    assert benchmark(lambda: tags.get_tags(db))
+
+
+# The writes commit into a savepoint, the db fixture rolls all of them back
+
+def test_create_recipe(benchmark, db, user):
+    body = {key: value for key, value in big_recipe(ingredients=10).items() if key not in ("id", "user")}
+    titles = count()
+
+    def create():
+        return recipes.create_recipe(RecipeCreate(**{**body, "title": f"Bench {next(titles)}"}), db, user)
+    assert len(benchmark(create).ingredients) == 10
+
+def test_update_recipe(benchmark, db, user):
+    recipe = RecipeSchema.model_validate_json(recipes.get_single_recipe(1, db, validators("/api/recipes/1"), full).body)
+    serves = count(1)
+
+    def update():
+        return recipes.update_recipe(1, recipe.model_copy(update={"serves": next(serves)}), db, user)
+    assert benchmark(update).id == 1
+
+def test_delete_recipe(benchmark, db, user):
+    titles = count()
+
+    def new_recipe():
+        created = recipes.create_recipe(RecipeCreate(title=f"Doomed {next(titles)}", recipe_type="entree",
+                                                     cuisine_tags="pasta", serves=2, notes=""), db, user)
+        return (created.id, db, user), {}
+    benchmark.pedantic(recipes.delete_recipe, setup=new_recipe, rounds=100)
+    assert db.query(RecipeModel).filter(RecipeModel.title.like("Doomed %")).count() == 0
+
+def test_create_ingredients_bulk(benchmark, db, user):
+    # spread over many recipes, SQLite's search triggers re-read a recipe's ingredients on every insert
+    recipe_ids = cycle(db.scalars(select(RecipeModel.id).limit(200)).all())
+
+    def create():
+        recipe_id = next(recipe_ids)
+        rows = [IngredientSchema(name=f"Spice {number}", quantity="1 pinch", recipe_id=recipe_id) for number in range(20)]
+        return ingredients.create_ingredients_bulk(rows, db, user)
+    assert len(benchmark(create)) == 20
+
+def test_update_ingredient(benchmark, db, user):
+    quantities = count(1)
+
+    def update():
+        return ingredients.update_ingredient(1, IngredientSchema(name="Angel Hair Pasta", quantity=f"{next(quantities)}lb",
+                                                                 recipe_id=1), db, user)
+    assert benchmark(update).id == 1
+
+def test_create_steps_bulk(benchmark, db, user):
+    rows = [StepSchema(step_order=number, step_details=f"Step {number}", recipe_id=1) for number in range(11, 21)]
+    assert len(benchmark(steps.create_steps_bulk, rows, db, user)) == 10
+
+def test_move_step(benchmark, db, user):
+    orders = count()
+
+    def move():
+        # back and forth between the first and last place
+        return steps.move_step(1, StepMove(step_order=10 if next(orders) % 2 == 0 else 1), db, user)
+    assert len(benchmark(move)) == 10
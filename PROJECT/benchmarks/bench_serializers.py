@@ -0,0 +1,45 @@
+# benchmarks/bench_serializers.py
+#
+#   python -m pytest benchmarks/bench_serializers.py --benchmark-autosave
+
+import pytest
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from serializers.recipe import RecipeSchema, RecipeCreate
+from benchmarks.lib import big_recipe
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def payload():
+    return big_recipe(ingredients=50)
+
+@pytest.fixture(scope="module")
+def recipe_model(payload):
+    # The same recipe as an ORM graph, the way get_single_recipe serializes it
+    return RecipeModel(
+        **{key: value for key, value in payload.items() if key not in ("user", "ingredients", "steps")},
+        user=UserModel(**payload["user"]),
+        ingredients=[IngredientModel(**ingredient) for ingredient in payload["ingredients"]],
+        steps=[StepModel(**step) for step in payload["steps"]],
+    )
+
+
+def test_recipe_schema_validate(benchmark, payload):
+    recipe = benchmark(RecipeSchema.model_validate, payload)
+    assert len(recipe.ingredients) == 50
+
+def test_recipe_schema_from_orm(benchmark, recipe_model):
+    recipe = benchmark(RecipeSchema.model_validate, recipe_model, from_attributes=True)
+    assert len(recipe.ingredients) == 50
+
+def test_recipe_schema_dump_json(benchmark, payload):
+    recipe = RecipeSchema.model_validate(payload)
+    assert benchmark(recipe.model_dump_json).startswith("{")
+
+def test_recipe_create_validate(benchmark, payload):
+    body = {key: value for key, value in payload.items() if key not in ("id", "user")}
+    assert len(benchmark(RecipeCreate.model_validate, body).ingredients) == 50
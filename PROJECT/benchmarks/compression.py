@@ -0,0 +1,112 @@
+# benchmarks/compression.py
+#
+# Bytes on the wire against response time for gzip levels, on a seeded catalogue.
+#
+#   python benchmarks/compression.py                   # 10k recipes, levels 1, 6 and 9
+#   python benchmarks/compression.py --recipes 1000 --levels 1,9 --runs 5
+#
+# Seeds a throwaway SQLite database, then fetches the full NDJSON export (streamed)
+# and a 200 recipe page of GET /api/recipes (one body) with gzip refused and at each
+# level, and prints the median time and the compressed size for each.
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from models.database import get_db
+from middleware.compression import CompressionMiddleware
+from controllers.recipes import router as RecipesRouter
+from config.environment import gzip_minimum_size
+
+ENDPOINTS = ("/api/recipes/export", "/api/recipes?limit=200")
+
+
+def seed(engine, recipes: int):
+    with engine.begin() as connection:
+        connection.execute(insert(UserModel), [{"id": 1, "username": "bench", "email": "bench@bench.com"}])
+        connection.execute(insert(RecipeModel), [
+            {"id": number, "title": f"Recipe {number}", "recipe_type": ("main", "side", "dessert")[number % 3],
+             "cuisine_tags": "italian, pasta" if number % 2 else "mexican, spicy", "serves": 2 + number % 6,
+             "notes": f"Notes for recipe {number}, best served fresh.", "user_id": 1}
+            for number in range(1, recipes + 1)
+        ])
+        connection.execute(insert(IngredientModel), [
+            {"name": f"Ingredient {number % 50}", "quantity": f"{1 + number % 4} cups", "recipe_id": recipe}
+            for recipe in range(1, recipes + 1) for number in range(8)
+        ])
+        connection.execute(insert(StepModel), [
+            {"step_order": number, "step_details": f"Step {number}: stir, then cook for {number * 5} minutes.",
+             "recipe_id": recipe}
+            for recipe in range(1, recipes + 1) for number in range(1, 7)
+        ])
+
+def make_client(SessionLocal, level):
+    app = FastAPI()
+    app.include_router(RecipesRouter, prefix="/api")
+    if level is not None:
+        app.add_middleware(CompressionMiddleware, minimum_size=gzip_minimum_size, compresslevel=level)
+
+    def _get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    app.dependency_overrides[get_db] = _get_db
+    return TestClient(app)
+
+def measure(client, url: str, level, runs: int):
+    accept_encoding = "identity" if level is None else "gzip"
+    timings, size = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        with client.stream("GET", url, headers={"Accept-Encoding": accept_encoding}) as response:
+            size = sum(len(chunk) for chunk in response.iter_raw())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gzip levels on a seeded catalogue")
+    parser.add_argument("--recipes", type=int, default=10_000)
+    parser.add_argument("--levels", default="1,6,9", help="comma separated gzip levels")
+    parser.add_argument("--runs", type=int, default=3, help="requests per measurement, the median is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        print(f"seeding {args.recipes} recipes...")
+        seed(engine, args.recipes)
+        SessionLocal = sessionmaker(bind=engine)
+
+        levels = [None] + [int(level) for level in args.levels.split(",")]
+        print(f"{'endpoint':<26} {'gzip':>8} {'bytes':>12} {'ratio':>7} {'median ms':>10}")
+        for url in ENDPOINTS:
+            baseline = None
+            for level in levels:
+                with make_client(SessionLocal, level) as client:
+                    client.get(url)  # warm up
+                    seconds, size = measure(client, url, level, args.runs)
+                baseline = baseline or size
+                print(f"{url:<26} {'off' if level is None else level:>8} {size:>12,} "
+                      f"{size / baseline:>7.2f} {seconds * 1000:>10.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
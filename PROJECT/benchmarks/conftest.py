@@ -0,0 +1,69 @@
+# benchmarks/conftest.py
+#
+# Fixtures for the micro-benchmarks (bench_*.py): a SQLite catalogue built by
+# repeating the data/ seed rows BENCH_RECIPES times over, and sessions on it whose
+# commits only release a savepoint, so the write benchmarks leave nothing behind.
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.base import Base
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from models import search
+from data.loader import load, load_tags
+from cache.recipes import recipe_cache
+from dependencies.get_current_user import token_cache
+from benchmarks.lib import scaled_catalogue, user_rows
+
+BENCH_RECIPES = int(os.getenv("BENCH_RECIPES", "1000"))
+
+
+@pytest.fixture(scope="session")
+def bench_engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('bench')}/bench.db")
+
+    # pysqlite's own transaction handling gets in the way of SAVEPOINT, let SQLAlchemy emit BEGIN
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(bind=engine)
+    scaled = scaled_catalogue(BENCH_RECIPES)
+    with engine.begin() as connection:
+        load(connection, UserModel, user_rows)
+        load(connection, RecipeModel, scaled["recipes"])
+        load(connection, IngredientModel, scaled["ingredients"])
+        load(connection, StepModel, scaled["steps"])
+        load_tags(connection)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(bench_engine):
+    # The controllers commit, here that releases a savepoint inside a transaction that's rolled back
+    connection = bench_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    recipe_cache.clear()
+    token_cache.clear()
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture
+def user(db):
+    return db.get(UserModel, 1)
@@ -0,0 +1,49 @@
+# benchmarks/lib.py
+
+from itertools import count, cycle, islice
+from starlette.requests import Request
+from starlette.responses import Response
+from data.recipe_data import recipes_list, ingredients_list, steps_list
+from data.user_data import user_list
+from data.loader import instance_rows
+from dependencies.conditional import Conditional
+from dependencies.pagination import Page
+
+user_rows = list(instance_rows(user_list))
+recipe_rows = list(instance_rows(recipes_list))
+ingredient_rows = list(instance_rows(ingredients_list))
+step_rows = list(instance_rows(steps_list))
+
+
+def scaled_catalogue(recipes: int):
+    """ The seed recipes, ingredients and steps repeated until there are this many recipes """
+    ingredient_ids, step_ids = count(1), count(1)
+    scaled = {"recipes": [], "ingredients": [], "steps": []}
+    for recipe_id, recipe in zip(range(1, recipes + 1), cycle(recipe_rows)):
+        scaled["recipes"].append({**recipe, "id": recipe_id, "title": f"{recipe['title']} {recipe_id}"})
+        scaled["ingredients"].extend({**row, "id": next(ingredient_ids), "recipe_id": recipe_id}
+                                     for row in ingredient_rows if row['recipe_id'] == recipe['id'])
+        scaled["steps"].extend({**row, "id": next(step_ids), "recipe_id": recipe_id}
+                               for row in step_rows if row['recipe_id'] == recipe['id'])
+    return scaled
+
+def big_recipe(ingredients: int = 50):
+    """ A RecipeSchema-shaped dict of the first seed recipe with its ingredients repeated up to this many """
+    recipe = {key: value for key, value in recipe_rows[0].items() if key != "user_id"}
+    recipe["user"] = {key: user_rows[0][key] for key in ("username", "email")}
+    recipe["ingredients"] = [{**row, "id": number, "name": f"{row['name']} {number}"}
+                             for number, row in enumerate(islice(cycle(ingredient_rows), ingredients), start=1)]
+    recipe["steps"] = [dict(row) for row in step_rows]
+    return recipe
+
+
+def get_request(path: str = "/api/recipes", headers=None) -> Request:
+    """ What FastAPI hands a controller's Request/Response dependencies """
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"",
+                    "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]})
+
+def validators(path: str = "/api/recipes", headers=None) -> Conditional:
+    return Conditional(get_request(path, headers), Response())
+
+def page(limit: int = 20) -> Page:
+    return Page(Response(), limit, None, False)
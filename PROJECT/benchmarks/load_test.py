@@ -0,0 +1,332 @@
+# benchmarks/load_test.py
+#
+# Mixed read/write traffic against the recipe API from many concurrent clients,
+# reported as JSON: p50/p95/p99 latency, error rate and requests per second for
+# each endpoint and overall.
+#
+#   python benchmarks/load_test.py --serve                      # uvicorn main:app on DATABASE_URL
+#   python benchmarks/load_test.py --url http://127.0.0.1:8000 --clients 50 --duration 60
+#   python benchmarks/load_test.py --serve --mix list=50,detail=30,create=10,update=7,delete=3 --output run.json
+#
+# Every client logs in through /api/login as one of --users (round robin), then runs
+# list, detail, create, update and delete calls across recipes, ingredients and steps,
+# picked by the --mix weights. Updates and deletes only touch rows the client created
+# itself, so nothing fails on ownership. Recipes still left at the end are deleted
+# (outside the measurements). Seed the database first, with seed.py or generate.py
+# (use --users cook1,cook2,.. for a generated catalogue).
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+
+PROJECT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+OPERATIONS = ("list", "detail", "create", "update", "delete")
+DEFAULT_MIX = "list=45,detail=35,create=8,update=8,delete=4"
+
+
+def parse_mix(value: str) -> dict:
+    """ "list=45,detail=35" -> {"list": 45.0, "detail": 35.0}, operations left out get no traffic """
+    mix = {}
+    for part in value.split(","):
+        operation, _, weight = part.partition("=")
+        operation = operation.strip()
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        mix[operation] = float(weight)
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one operation with a weight")
+    return mix
+
+
+def percentile(ordered, fraction: float) -> float:
+    """ Nearest-rank percentile of an already sorted list """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class Results:
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def _summary(self, latencies, errors: int, elapsed: float) -> dict:
+        ordered = sorted(latencies)
+        return {
+            "requests": len(ordered),
+            "errors": errors,
+            "error_rate": round(errors / len(ordered), 4) if ordered else 0.0,
+            "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        }
+
+    def summary(self, elapsed: float) -> dict:
+        every = [seconds for latencies in self.latencies.values() for seconds in latencies]
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "total": self._summary(every, sum(self.errors.values()), elapsed),
+            "endpoints": {endpoint: self._summary(latencies, self.errors[endpoint], elapsed)
+                          for endpoint, latencies in sorted(self.latencies.items())},
+        }
+
+
+class Client:
+    # One simulated user: its own token, and the recipes, ingredients and steps it
+    # created (id -> recipe id), which are the only rows it updates or deletes.
+
+    def __init__(self, http: httpx.AsyncClient, results: Results, rng: random.Random, username: str, known: dict):
+        self.http = http
+        self.results = results
+        self.rng = rng
+        self.username = username
+        self.known = known
+        self.headers = {}
+        self.recipes = []
+        self.ingredients = {}
+        self.steps = {}
+
+    async def request(self, endpoint: str, method: str, url: str, record: bool = True, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        if record:
+            self.results.record(endpoint, time.perf_counter() - start, response is not None and response.status_code < 400)
+        return response if response is not None and response.status_code < 400 else None
+
+    async def login(self):
+        response = await self.http.post("/api/login", json={"username": self.username})
+        if response.status_code != 200:
+            raise SystemExit(f"Can't log in as {self.username}: {response.status_code} {response.text}")
+        self.headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    async def list(self):
+        resource = self.rng.choice(("recipes", "ingredients", "steps"))
+        await self.request(f"GET /api/{resource}", "GET", f"/api/{resource}", params={"limit": 20})
+
+    async def detail(self):
+        # steps have no detail endpoint, they come with their recipe
+        resource = self.rng.choice(("recipes", "ingredients"))
+        ids = self.known[resource]
+        if not ids:
+            return await self.list()
+        await self.request(f"GET /api/{resource}/{{id}}", "GET", f"/api/{resource}/{self.rng.choice(ids)}")
+
+    async def create(self):
+        resource = self.rng.choice(("recipes", "ingredients", "steps"))
+        if resource == "recipes" or not self.recipes:
+            return await self.create_recipe()
+        recipe_id = self.rng.choice(self.recipes)
+        if resource == "ingredients":
+            created = await self.request("POST /api/ingredients", "POST", "/api/ingredients",
+                                         json={"name": "Salt", "quantity": "To taste", "recipe_id": recipe_id})
+            if created:
+                self.ingredients[created.json()['id']] = recipe_id
+        else:
+            created = await self.request("POST /api/steps", "POST", "/api/steps",
+                                         json={"step_order": self.rng.randint(1, 10), "step_details": "Stir well.",
+                                               "recipe_id": recipe_id})
+            if created:
+                self.steps[created.json()['id']] = recipe_id
+
+    async def create_recipe(self, record: bool = True):
+        payload = {
+            "title": f"Load test {uuid.uuid4().hex[:12]}", "recipe_type": "entree", "cuisine_tags": "italian, quick",
+            "serves": 4, "notes": "",
+            "ingredients": [{"name": f"Ingredient {number}", "quantity": "1 cup"} for number in range(5)],
+            "steps": [{"step_order": number, "step_details": f"Step {number}."} for number in range(1, 5)],
+        }
+        created = await self.request("POST /api/recipes", "POST", "/api/recipes", record=record, json=payload)
+        if created:
+            recipe = created.json()
+            self.recipes.append(recipe['id'])
+            self.ingredients.update((ingredient['id'], recipe['id']) for ingredient in recipe['ingredients'])
+            self.steps.update((step['id'], recipe['id']) for step in recipe['steps'])
+
+    async def update(self):
+        resource = self.rng.choice(("recipes", "ingredients", "steps"))
+        if not self.recipes:
+            return await self.create_recipe()
+        if resource == "recipes":
+            recipe_id = self.rng.choice(self.recipes)
+            # RecipeSchema wants the user too, update_recipe doesn't touch it
+            await self.request("PUT /api/recipes/{id}", "PUT", f"/api/recipes/{recipe_id}",
+                               json={"title": f"Load test {uuid.uuid4().hex[:12]}", "recipe_type": "entree",
+                                     "cuisine_tags": "italian, quick", "serves": self.rng.randint(1, 12), "notes": "",
+                                     "user": {"username": self.username, "email": f"{self.username}@example.com"}})
+        elif resource == "ingredients" and self.ingredients:
+            ingredient_id, recipe_id = self.rng.choice(list(self.ingredients.items()))
+            await self.request("PUT /api/ingredients/{id}", "PUT", f"/api/ingredients/{ingredient_id}",
+                               json={"name": "Pepper", "quantity": f"{self.rng.randint(1, 4)} pinches",
+                                     "recipe_id": recipe_id})
+        elif resource == "steps" and self.steps:
+            step_id, recipe_id = self.rng.choice(list(self.steps.items()))
+            await self.request("PUT /api/steps/{id}", "PUT", f"/api/steps/{step_id}",
+                               json={"step_order": self.rng.randint(1, 10), "step_details": "Stir again.",
+                                     "recipe_id": recipe_id})
+        else:
+            await self.create()
+
+    async def delete(self):
+        resource = self.rng.choice(("recipes", "ingredients", "steps"))
+        if resource == "ingredients" and self.ingredients:
+            ingredient_id = self.rng.choice(list(self.ingredients))
+            del self.ingredients[ingredient_id]
+            await self.request("DELETE /api/ingredients/{id}", "DELETE", f"/api/ingredients/{ingredient_id}")
+        elif resource == "steps" and self.steps:
+            step_id = self.rng.choice(list(self.steps))
+            del self.steps[step_id]
+            await self.request("DELETE /api/steps/{id}", "DELETE", f"/api/steps/{step_id}")
+        elif self.recipes:
+            await self.delete_recipe(self.recipes.pop(self.rng.randrange(len(self.recipes))))
+        else:
+            await self.create_recipe()
+
+    async def delete_recipe(self, recipe_id: int, record: bool = True):
+        self.ingredients = {key: value for key, value in self.ingredients.items() if value != recipe_id}
+        self.steps = {key: value for key, value in self.steps.items() if value != recipe_id}
+        await self.request("DELETE /api/recipes/{id}", "DELETE", f"/api/recipes/{recipe_id}", record=record)
+
+
+async def discover(http: httpx.AsyncClient, pages: int = 5) -> dict:
+    """ Ids for the detail calls, from the first pages of the recipe and ingredient lists """
+    known = {}
+    for resource in ("recipes", "ingredients"):
+        ids, params = [], {"limit": 100}
+        for _ in range(pages):
+            response = await http.get(f"/api/{resource}", params=params)
+            response.raise_for_status()
+            ids.extend(row['id'] for row in response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+        known[resource] = ids
+    return known
+
+
+async def run(http: httpx.AsyncClient, usernames, clients: int = 10, duration: float = None, requests: int = None,
+              mix: dict = None, seed: int = 0) -> dict:
+    """ Drive the API through http until duration seconds have passed or requests calls were made """
+    mix = mix or parse_mix(DEFAULT_MIX)
+    operations, weights = list(mix), list(mix.values())
+    results = Results()
+    known = await discover(http)
+    simulated = [Client(http, results, random.Random(f"{seed}:{number}"), usernames[number % len(usernames)], known)
+                 for number in range(clients)]
+    await asyncio.gather(*(client.login() for client in simulated))
+
+    budget = [requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def more() -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if budget[0] is not None:
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 1
+        return True
+
+    async def drive(client: Client):
+        while more():
+            operation = client.rng.choices(operations, weights=weights)[0]
+            await getattr(client, operation)()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(client) for client in simulated))
+    elapsed = time.perf_counter() - start
+
+    # Tidy up what the run created, outside the measurements
+    for client in simulated:
+        for recipe_id in client.recipes:
+            await client.delete_recipe(recipe_id, record=False)
+
+    summary = results.summary(elapsed)
+    summary["config"] = {"clients": clients, "duration_s": duration, "requests": requests, "mix": mix, "seed": seed,
+                         "users": list(usernames)}
+    return summary
+
+
+def serve(port: int, workers: int) -> subprocess.Popen:
+    """ uvicorn main:app on DATABASE_URL (whatever the environment says), once it answers """
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                               "--workers", str(workers), "--log-level", "warning"], cwd=PROJECT)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("uvicorn exited before it started serving")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("uvicorn didn't start within 30s")
+
+
+async def main_async(args) -> dict:
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as http:
+        return await run(http, args.users.split(","), clients=args.clients, duration=args.duration,
+                         requests=args.requests, mix=parse_mix(args.mix), seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay mixed read/write traffic against the recipe API")
+    parser.add_argument("--url", default=None, help="a running API (default: the one --serve starts)")
+    parser.add_argument("--serve", action="store_true", help="start uvicorn main:app for the run, on DATABASE_URL")
+    parser.add_argument("--port", type=int, default=8123, help="port for --serve")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --serve")
+    parser.add_argument("--users", default="nick123,charles,adam1Aa", help="comma separated usernames to log in as")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run for")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many calls instead")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0, help="the same seed gives every client the same sequence")
+    parser.add_argument("--timeout", type=float, default=30, help="per request timeout in seconds")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    if args.requests:
+        args.duration = None
+    if not args.url and not args.serve:
+        parser.error("give --url or --serve")
+
+    server = serve(args.port, args.workers) if args.serve else None
+    args.url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        report = asyncio.run(main_async(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# cache/recipes.py
+import asyncio
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from config.environment import cache_backend, redis_url, recipe_cache_size, recipe_cache_ttl, recipe_cache_local_ttl
+from .memory import TTLCache
+
+def make_recipe_cache():
+    if cache_backend == "redis":
+        # Only needed for the shared backend
+        from redis import Redis
+        from .redis_cache import RedisCache
+        return RedisCache(Redis.from_url(redis_url), prefix="recipes:", ttl=recipe_cache_ttl,
+                          local_maxsize=recipe_cache_size, local_ttl=recipe_cache_local_ttl)
+    return TTLCache(maxsize=recipe_cache_size, ttl=recipe_cache_ttl)
+
+# Recipe id -> (serialized RecipeSchema JSON, its conditional GET state).
+# Hot recipes are read far more often than they are written, so a hit skips the
+# database and the Pydantic validation entirely.
+recipe_cache = make_recipe_cache()
+
+async def call_cache(function, *args):
+    """ Call a cache method from an async route, in the threadpool if it's a network round trip """
+    if getattr(function.__self__, "remote", False):
+        return await run_in_threadpool(function, *args)
+    return function(*args)
+
+def _delete_recipes(recipe_ids):
+    for recipe_id in recipe_ids:
+        recipe_cache.delete(recipe_id)
+
+def evict_recipes(recipe_ids):
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None and recipe_cache.remote:
+        # An async route (or an AsyncSession's flush events) on the event loop: don't hold
+        # every other request up on Redis round trips, hand the deletes to the threadpool
+        loop.run_in_executor(None, _delete_recipes, recipe_ids)
+    else:
+        _delete_recipes(recipe_ids)
+
+
+def _changed_recipes(session):
+    recipe_ids, user_ids = set(), set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, RecipeModel):
+            recipe_ids.add(instance.id)
+        elif isinstance(instance, (IngredientModel, StepModel)):
+            # Both the old and the new recipe, if the row moved between recipes
+            history = inspect(instance).attrs.recipe_id.history
+            recipe_ids.update(history.added or (), history.deleted or (), history.unchanged or ())
+        elif isinstance(instance, UserModel):
+            user_ids.add(instance.id)
+    if user_ids:
+        # A recipe's payload embeds its user. Look the recipes up on the flush's own
+        # connection (a Core select, the session can't autoflush in the middle of a flush).
+        owned = select(RecipeModel.id).where(RecipeModel.user_id.in_(user_ids))
+        recipe_ids.update(session.connection().execute(owned).scalars())
+    return recipe_ids
+
+# Every create, update and delete in the recipe, ingredient and step controllers goes through
+# a flush. Evict what it touched straight away, and again once it commits, which drops an entry
+# cached by a request that read the old rows between the two. It doesn't close every race: a
+# reader that loaded the old rows before the commit and stores them after it still caches a
+# stale payload, served until recipe_cache_ttl expires it. That TTL is the bound on staleness.
+# (Core UPDATEs bypass the session and call evict_recipes themselves.)
+@event.listens_for(Session, "after_flush")
+def _evict_flushed(session, flush_context):
+    recipe_ids = _changed_recipes(session)
+    evict_recipes(recipe_ids)
+    session.info.setdefault("recipe_cache_evict", set()).update(recipe_ids)
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session):
+    evict_recipes(session.info.pop("recipe_cache_evict", ()))
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop("recipe_cache_evict", None)
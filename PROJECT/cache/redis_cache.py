@@ -0,0 +1,182 @@
+# cache/redis_cache.py
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+import orjson
+from redis import Redis, RedisError
+from .memory import TTLCache
+
+
+def _tag(value):
+    # JSON has no tuples or datetimes, which the recipe entries' conditional GET state is
+    # made of. Tag them so they come back as the same types (and so give the same ETag).
+    if isinstance(value, tuple):
+        return {"__tuple__": [_tag(item) for item in value]}
+    if isinstance(value, list):
+        return [_tag(item) for item in value]
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return value
+
+def _untag(value):
+    if isinstance(value, list):
+        return [_untag(item) for item in value]
+    if isinstance(value, dict):
+        if "__tuple__" in value:
+            return tuple(_untag(item) for item in value["__tuple__"])
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+def dumps(value) -> bytes:
+    """ Encode a cache value (JSON types, tuples and datetimes) for Redis """
+    return orjson.dumps(_tag(value))
+
+def loads(data: bytes):
+    """ Decode what dumps() stored. Only ever JSON: whoever can write to Redis can't run code here """
+    return _untag(orjson.loads(data))
+
+
+class RedisCache:
+    # The same interface as TTLCache, for caches shared by every uvicorn worker and
+    # container. Entries live in Redis (with a TTL) under a key prefix. Each worker
+    # also keeps recently read entries in a small local TTLCache in front of Redis,
+    # so a hot key costs no round trip, and every delete is published on a channel
+    # that all workers subscribe to, so their local copies are dropped as well.
+    #
+    # Redis being unreachable turns reads into misses and writes into no-ops: the
+    # caller falls back to the database, and the TTLs bound how stale anything can get.
+    # That includes startup, the listener thread keeps trying to subscribe until Redis is back.
+
+    # Lookups can go over the network, async routes call them in the threadpool (see cache/recipes.py)
+    remote = True
+
+    def __init__(self, client: Redis, prefix: str, ttl: float, local_maxsize: int = 1024, local_ttl: float = 5):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.channel = f"{prefix}invalidate"
+        self.local = TTLCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+        self._pubsub = None
+        try:
+            self._subscribe()
+        except RedisError:
+            pass
+        self._stopped = Event()
+        self._listener = Thread(target=self._listen, name=f"{self.channel} listener", daemon=True)
+        self._listener.start()
+
+    def _name(self, key):
+        return f"{self.prefix}{key}"
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _on_invalidate(self, message):
+        name = message["data"].decode()
+        if name == "*":
+            self.local.clear()
+        else:
+            self.local.delete(name)
+
+    def _subscribe(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(**{self.channel: self._on_invalidate})
+        except RedisError:
+            pubsub.close()
+            raise
+        self._pubsub = pubsub
+        # Anything published while nobody was listening is lost, start over locally
+        self.local.clear()
+
+    def _listen(self):
+        while not self._stopped.is_set():
+            try:
+                if self._pubsub is None:
+                    self._subscribe()
+                # calls _on_invalidate for a message, if one arrives in time
+                self._pubsub.get_message(timeout=0.1)
+            except RedisError:
+                if self._pubsub is not None:
+                    self._pubsub.close()
+                    self._pubsub = None
+                self._stopped.wait(1)
+
+    def get(self, key):
+        """ Return the cached value or None, counting the hit or miss """
+        name = self._name(key)
+        value = self.local.get(name)
+        if value is None:
+            try:
+                with self.client.pipeline() as pipe:
+                    data, ttl_ms = pipe.get(name).pttl(name).execute()
+            except RedisError:
+                data = None
+            if data is not None:
+                value = loads(data)
+                # keep the local copy no longer than Redis keeps the shared one
+                self.local.set(name, value, expires_at=time.time() + ttl_ms / 1000 if ttl_ms > 0 else None)
+        self._count(value is not None)
+        return value
+
+    def set(self, key, value, expires_at: float = None):
+        expires_at = min(time.time() + self.ttl, expires_at or float("inf"))
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        name = self._name(key)
+        try:
+            self.client.set(name, dumps(value), px=ttl_ms)
+        except RedisError:
+            return
+        self.local.set(name, value, expires_at=expires_at)
+
+    def delete(self, key):
+        name = self._name(key)
+        self.local.delete(name)
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.delete(name).publish(self.channel, name).execute()
+        except RedisError:
+            pass
+
+    def clear(self):
+        self.local.clear()
+        try:
+            names = list(self.client.scan_iter(match=f"{self.prefix}*"))
+            if names:
+                self.client.delete(*names)
+            self.client.publish(self.channel, "*")
+        except RedisError:
+            pass
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.local),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        self._stopped.set()
+        self._listener.join()
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+    def __len__(self):
+        return len(self.local)
@@ -0,0 +1,104 @@
+# controllers/async_ingredients.py
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.ingredient import IngredientModel
+from models.recipe import RecipeModel
+from models.user import UserModel
+from serializers.fast import rows_to_dicts, ingredient_columns
+from serializers.ingredient import IngredientSchema
+from typing import List
+from models.async_database import get_async_db
+from dependencies.get_current_user_async import get_current_user_async
+from dependencies.pagination import Page, paginate
+from dependencies.conditional import Conditional, aggregate_state, conditional
+
+router = APIRouter()
+
+async def find_ingredient(db: AsyncSession, ingredient_id: int):
+    result = await db.execute(select(IngredientModel).where(IngredientModel.id == ingredient_id))
+    return result.scalars().first()
+
+async def check_recipe_owner(db: AsyncSession, recipe_id: int, current_user: UserModel):
+    # Only the recipe's creator may change its ingredients
+    result = await db.execute(select(RecipeModel.user_id).where(RecipeModel.id == recipe_id))
+    recipe = result.first()
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    if recipe.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+@router.get("/ingredients", response_model=List[IngredientSchema])
+async def get_ingredients(db: AsyncSession = Depends(get_async_db), page: Page = Depends(paginate), validators: Conditional = Depends(conditional)):
+    result = await db.execute(select(*aggregate_state(IngredientModel)))
+    not_modified = validators.not_modified(result.one())
+    if not_modified:
+        return not_modified
+
+    rows = await page.apply_async(db, select(*ingredient_columns), IngredientModel.id, scalars=False)
+    return ORJSONResponse(rows_to_dicts(rows), headers=page.response.headers)
+
+@router.get("/ingredients/{ingredient_id}", response_model=IngredientSchema)
+async def get_single_ingredient(ingredient_id: int, db: AsyncSession = Depends(get_async_db), validators: Conditional = Depends(conditional)):
+    result = await db.execute(select(IngredientModel.updated_at).where(IngredientModel.id == ingredient_id))
+    state = result.first()
+    if not state:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    not_modified = validators.not_modified(state)
+    if not_modified:
+        return not_modified
+
+    ingredient = await find_ingredient(db, ingredient_id)
+    if not ingredient:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    return ingredient
+
+@router.post("/ingredients", response_model=IngredientSchema)
+async def create_ingredient(ingredient: IngredientSchema, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    await check_recipe_owner(db, ingredient.recipe_id, current_user)
+
+    new_ingredient = IngredientModel(**ingredient.dict())
+    db.add(new_ingredient)
+    await db.commit()
+    return new_ingredient
+
+@router.post("/ingredients/bulk", response_model=List[IngredientSchema])
+async def create_ingredients_bulk(ingredients: List[IngredientSchema], db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    recipe_ids = {ingredient.recipe_id for ingredient in ingredients}
+    result = await db.execute(select(RecipeModel.user_id).where(RecipeModel.id.in_(recipe_ids)))
+    owner_ids = result.scalars().all()
+    if len(owner_ids) != len(recipe_ids):
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    if any(owner_id != current_user.id for owner_id in owner_ids):
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    new_ingredients = [IngredientModel(**ingredient.dict()) for ingredient in ingredients]
+    db.add_all(new_ingredients)
+    await db.commit()
+    return new_ingredients
+
+@router.put("/ingredients/{ingredient_id}", response_model=IngredientSchema)
+async def update_ingredient(ingredient_id: int, ingredient: IngredientSchema, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    db_ingredient = await find_ingredient(db, ingredient_id)
+    if not db_ingredient:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    await check_recipe_owner(db, db_ingredient.recipe_id, current_user)
+
+    ingredient_data = ingredient.dict(exclude_unset=True, exclude={"id"})
+    for key, value in ingredient_data.items():
+        setattr(db_ingredient, key, value)
+    await db.commit()
+    return db_ingredient
+
+@router.delete("/ingredients/{ingredient_id}")
+async def delete_ingredient(ingredient_id: int, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    db_ingredient = await find_ingredient(db, ingredient_id)
+    if not db_ingredient:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    await check_recipe_owner(db, db_ingredient.recipe_id, current_user)
+
+    await db.delete(db_ingredient)
+    await db.commit()
+    return {"message": f"Ingredient {ingredient_id} deleted successfully"}
@@ -0,0 +1,147 @@
+# controllers/async_recipes.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.recipe import RecipeModel
+from models.step import StepModel
+from models.ingredient import IngredientModel
+from models.user import UserModel
+from models.tag import TagModel, recipe_tags
+from models.search import search_recipes as search_recipes_query
+from serializers.recipe import RecipeSchema, RecipeCreate as RecipeCreateSchema
+from serializers.ingredient import IngredientSchema
+from serializers.step import StepSchema
+from serializers.user import UserSchema
+from serializers.fast import build_recipes, project_recipe, recipe_children
+from typing import List, Optional
+from models.async_database import get_async_db
+from dependencies.get_current_user_async import get_current_user_async
+from dependencies.pagination import Page, paginate
+from dependencies.conditional import Conditional, conditional
+from dependencies.fieldsets import Fieldset, recipe_fieldset
+from controllers.recipes import (recipe_graph, sparse_recipe_graph, recipe_rows, recipe_state, recipes_state,
+                                 recipe_entry, cached_recipe_response)
+from cache.recipes import recipe_cache, call_cache
+from config.environment import export_batch_size
+
+
+router = APIRouter()
+
+async def find_recipe(db: AsyncSession, recipe_id: int, *options):
+    result = await db.execute(select(RecipeModel).options(*options).where(RecipeModel.id == recipe_id))
+    return result.scalars().first()
+
+@router.get("/recipes", response_model=List[RecipeSchema])
+async def get_recipes(tag: Optional[str] = None, db: AsyncSession = Depends(get_async_db), page: Page = Depends(paginate),
+                      validators: Conditional = Depends(conditional), fieldset: Fieldset = Depends(recipe_fieldset)):
+    result = await db.execute(select(*recipes_state()))
+    not_modified = validators.not_modified(result.one())
+    if not_modified:
+        return not_modified
+
+    statement = recipe_rows(fieldset)
+    if tag:
+        tagged = select(recipe_tags.c.recipe_id).join(TagModel).where(TagModel.name == tag.strip().lower())
+        statement = statement.where(RecipeModel.id.in_(tagged))
+    rows = await page.apply_async(db, statement, RecipeModel.id, scalars=False)
+
+    children = {}
+    if rows:
+        for name, child_statement in recipe_children([row.id for row in rows], fieldset.include).items():
+            children[name] = (await db.execute(child_statement)).all()
+    recipes = build_recipes(rows, children, fieldset.fields, fieldset.include)
+    return ORJSONResponse(recipes, headers=page.response.headers)
+
+@router.get("/recipes/export")
+async def export_recipes(db: AsyncSession = Depends(get_async_db)):
+    async def generate():
+        statement = select(RecipeModel).options(*recipe_graph).order_by(RecipeModel.id)
+        recipes = await db.stream(statement.execution_options(yield_per=export_batch_size))
+        async for recipe in recipes.scalars():
+            yield RecipeSchema.model_validate(recipe, from_attributes=True).model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/recipes/search", response_model=List[RecipeSchema])
+async def search_recipes(q: str = Query(..., min_length=1, max_length=200), db: AsyncSession = Depends(get_async_db),
+                         page: Page = Depends(paginate)):
+    statement, rank = search_recipes_query(select(RecipeModel).options(*recipe_graph), db.get_bind().dialect.name, q)
+    return await page.apply_ranked_async(db, statement, rank, RecipeModel.id)
+
+@router.get("/recipes/{recipe_id}", response_model=RecipeSchema)
+async def get_single_recipe(recipe_id: int, db: AsyncSession = Depends(get_async_db), validators: Conditional = Depends(conditional),
+                            fieldset: Fieldset = Depends(recipe_fieldset)):
+    cached = None if fieldset.sparse else await call_cache(recipe_cache.get, recipe_id)
+    if cached is not None:
+        return cached_recipe_response(cached, validators, "HIT")
+
+    result = await db.execute(select(*recipe_state(recipe_id)))
+    state = result.one()
+    if state[0] is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    not_modified = validators.not_modified(state)
+    if not_modified:
+        return not_modified
+
+    if fieldset.sparse:
+        recipe = await find_recipe(db, recipe_id, *sparse_recipe_graph(fieldset))
+        if not recipe:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        return ORJSONResponse(project_recipe(recipe, fieldset.fields, fieldset.include), headers=validators.headers)
+
+    recipe = await find_recipe(db, recipe_id, *recipe_graph)
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    cached = recipe_entry(recipe, state)
+    await call_cache(recipe_cache.set, recipe_id, cached)
+    return cached_recipe_response(cached, validators, "MISS")
+
+@router.post("/recipes", response_model=RecipeSchema)
+async def create_recipe(recipe: RecipeCreateSchema, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    recipe_data = recipe.dict(exclude={"ingredients", "steps"})
+    new_recipe = RecipeModel(**recipe_data, user_id=current_user.id)
+    new_recipe.ingredients = [IngredientModel(**ingredient.dict()) for ingredient in recipe.ingredients]
+    new_recipe.steps = [StepModel(**step.dict()) for step in recipe.steps]
+    db.add(new_recipe)
+    await db.flush()
+
+    created = RecipeSchema(
+        id=new_recipe.id,
+        **recipe_data,
+        user=UserSchema.model_validate(current_user, from_attributes=True),
+        ingredients=[IngredientSchema.model_validate(ingredient, from_attributes=True) for ingredient in new_recipe.ingredients],
+        steps=[StepSchema.model_validate(step, from_attributes=True) for step in new_recipe.steps],
+    )
+    await db.commit()
+    return created
+
+@router.put("/recipes/{recipe_id}", response_model=RecipeSchema)
+async def update_recipe(recipe_id: int, recipe: RecipeSchema, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    # Load the graph up front, the response can't lazy load it afterwards
+    db_recipe = await find_recipe(db, recipe_id, *recipe_graph)
+    if not db_recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    if db_recipe.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    # Like the sync route, only the recipe's own columns can be changed here
+    recipe_data = recipe.dict(exclude_unset=True, exclude={"id", "user", "ingredients", "steps"})
+    for key, value in recipe_data.items():
+        setattr(db_recipe, key, value)
+    await db.commit()
+    return db_recipe
+
+@router.delete("/recipes/{recipe_id}")
+async def delete_recipe(recipe_id: int, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    db_recipe = await find_recipe(db, recipe_id)
+    if not db_recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    if db_recipe.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    await db.delete(db_recipe)
+    await db.commit()
+    return {"message": f"Recipe {recipe_id} deleted successfully"}
@@ -0,0 +1,110 @@
+# controllers/async_steps.py
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.step import StepModel
+from models.recipe import RecipeModel
+from models.user import UserModel
+from serializers.fast import rows_to_dicts, step_columns
+from serializers.step import StepSchema, StepMove
+from typing import List
+from models.async_database import get_async_db
+from dependencies.get_current_user_async import get_current_user_async
+from dependencies.pagination import Page, paginate
+from cache.recipes import evict_recipes
+from dependencies.conditional import Conditional, aggregate_state, conditional
+from controllers.steps import move_step_statement, step_move_columns
+
+router = APIRouter()
+
+async def find_step(db: AsyncSession, step_id: int):
+    result = await db.execute(select(StepModel).where(StepModel.id == step_id))
+    return result.scalars().first()
+
+async def check_recipe_owner(db: AsyncSession, recipe_id: int, current_user: UserModel):
+    # Only the recipe's creator may change its steps
+    result = await db.execute(select(RecipeModel.user_id).where(RecipeModel.id == recipe_id))
+    recipe = result.first()
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    if recipe.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+@router.get("/steps", response_model=List[StepSchema])
+async def get_steps(db: AsyncSession = Depends(get_async_db), page: Page = Depends(paginate), validators: Conditional = Depends(conditional)):
+    result = await db.execute(select(*aggregate_state(StepModel)))
+    not_modified = validators.not_modified(result.one())
+    if not_modified:
+        return not_modified
+
+    rows = await page.apply_async(db, select(*step_columns), StepModel.id, scalars=False)
+    return ORJSONResponse(rows_to_dicts(rows), headers=page.response.headers)
+
+@router.post("/steps", response_model=StepSchema)
+async def create_step(step: StepSchema, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    await check_recipe_owner(db, step.recipe_id, current_user)
+
+    new_step = StepModel(**step.dict())
+    db.add(new_step)
+    await db.commit()
+    return new_step
+
+@router.post("/steps/bulk", response_model=List[StepSchema])
+async def create_steps_bulk(steps: List[StepSchema], db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    recipe_ids = {step.recipe_id for step in steps}
+    result = await db.execute(select(RecipeModel.user_id).where(RecipeModel.id.in_(recipe_ids)))
+    owner_ids = result.scalars().all()
+    if len(owner_ids) != len(recipe_ids):
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    if any(owner_id != current_user.id for owner_id in owner_ids):
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    new_steps = [StepModel(**step.dict()) for step in steps]
+    db.add_all(new_steps)
+    await db.commit()
+    return new_steps
+
+@router.put("/steps/{step_id}/move", response_model=List[StepSchema])
+async def move_step(step_id: int, move: StepMove, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    result = await db.execute(select(*step_move_columns()).join(RecipeModel).where(StepModel.id == step_id))
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Step not found")
+    if row.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    position = min(move.step_order, row.step_count)
+    if position != row.position:
+        await db.execute(move_step_statement(row.recipe_id, step_id, row.position, position))
+        await db.commit()
+        # a Core UPDATE, so the session's flush events never see it
+        evict_recipes([row.recipe_id])
+
+    result = await db.execute(select(StepModel).where(StepModel.recipe_id == row.recipe_id).order_by(StepModel.step_order, StepModel.id))
+    return result.scalars().all()
+
+@router.put("/steps/{step_id}", response_model=StepSchema)
+async def update_step(step_id: int, step: StepSchema, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    db_step = await find_step(db, step_id)
+    if not db_step:
+        raise HTTPException(status_code=404, detail="Step not found")
+    await check_recipe_owner(db, db_step.recipe_id, current_user)
+
+    step_data = step.dict(exclude_unset=True, exclude={"id"})
+    for key, value in step_data.items():
+        setattr(db_step, key, value)
+    await db.commit()
+    return db_step
+
+@router.delete("/steps/{step_id}")
+async def delete_step(step_id: int, db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user_async)):
+    db_step = await find_step(db, step_id)
+    if not db_step:
+        raise HTTPException(status_code=404, detail="Step not found")
+    await check_recipe_owner(db, db_step.recipe_id, current_user)
+
+    await db.delete(db_step)
+    await db.commit()
+    return {"message": f"Step {step_id} deleted successfully"}
@@ -0,0 +1,27 @@
+# controllers/async_users.py
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import UserModel
+from serializers.user import UserSchema, UserLogin, UserToken
+from models.async_database import get_async_db
+
+router = APIRouter()
+
+@router.post("/register", response_model=UserSchema)
+async def create_user(user: UserSchema, db: AsyncSession = Depends(get_async_db)):
+    new_user = UserModel(**user.dict())
+    db.add(new_user)
+    await db.commit()
+    return new_user
+
+@router.post("/login", response_model=UserToken)
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(UserModel).where(UserModel.username == user.username))
+    db_user = result.scalars().first()
+    if not db_user:
+        raise HTTPException(status_code=400, detail="Incorrect username")
+
+    token = db_user.generate_token()
+    return {"token": token, "message": "Welcome back!"}
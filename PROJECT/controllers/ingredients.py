@@ -1,24 +1,40 @@
 # controllers/ingredients.py
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from models.ingredient import IngredientModel
 from models.recipe import RecipeModel
+from serializers.fast import rows_to_dicts, ingredient_columns
 from serializers.ingredient import IngredientSchema
 from models.user import UserModel # import user model
 from typing import List
 from models.database import get_db
 from dependencies.get_current_user import get_current_user
+from dependencies.pagination import Page, paginate
+from dependencies.conditional import Conditional, aggregate_state, conditional
 
 router = APIRouter()
 
 @router.get("/ingredients", response_model=List[IngredientSchema])
-def get_ingredients(db: Session = Depends(get_db)):
-    ingredients = db.query(IngredientModel).all()  
-    return ingredients
+def get_ingredients(db: Session = Depends(get_db), page: Page = Depends(paginate), validators: Conditional = Depends(conditional)):
+    not_modified = validators.not_modified(db.execute(select(*aggregate_state(IngredientModel))).one())
+    if not_modified:
+        return not_modified
+
+    rows = page.apply(db.query(*ingredient_columns), IngredientModel.id)
+    return ORJSONResponse(rows_to_dicts(rows), headers=page.response.headers)
 
 @router.get("/ingredients/{ingredient_id}", response_model=IngredientSchema)
-def get_single_ingredient(ingredient_id: int, db: Session = Depends(get_db)):
+def get_single_ingredient(ingredient_id: int, db: Session = Depends(get_db), validators: Conditional = Depends(conditional)):
+    state = db.query(IngredientModel.updated_at).filter(IngredientModel.id == ingredient_id).first()
+    if not state:
+         raise HTTPException(status_code=404, detail="Ingredient not found")
+    not_modified = validators.not_modified(state)
+    if not_modified:
+        return not_modified
+
     ingredient = db.query(IngredientModel).filter(IngredientModel.id == ingredient_id).first()
     if not ingredient:
          raise HTTPException(status_code=404, detail="Ingredient not found")
@@ -39,6 +55,25 @@ def create_ingredient(ingredient: IngredientSchema, db: Session = Depends(get_db
     db.refresh(new_ingredient)
     return new_ingredient
 
+@router.post("/ingredients/bulk", response_model=List[IngredientSchema])
+def create_ingredients_bulk(ingredients: List[IngredientSchema], db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
+    # Load every recipe the rows point at in one query and check ownership once for the whole batch
+    recipe_ids = {ingredient.recipe_id for ingredient in ingredients}
+    db_recipes = db.query(RecipeModel).filter(RecipeModel.id.in_(recipe_ids)).all() if recipe_ids else []
+    if len(db_recipes) != len(recipe_ids):
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    # Only the recipe's creator may add to it
+    if any(db_recipe.user_id != current_user.id for db_recipe in db_recipes):
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    new_ingredients = [IngredientModel(**ingredient.dict()) for ingredient in ingredients]
+    db.add_all(new_ingredients)
+    # flush assigns the ids, so the response can be built before commit expires the rows
+    db.flush()
+    created = [IngredientSchema.model_validate(ingredient, from_attributes=True) for ingredient in new_ingredients]
+    db.commit()
+    return created
+
 @router.put("/ingredients/{ingredient_id}", response_model=IngredientSchema)
 def update_ingredient(ingredient_id: int, ingredient: IngredientSchema, db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
     # find the ingredient to update
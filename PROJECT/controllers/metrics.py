@@ -0,0 +1,20 @@
+# controllers/metrics.py
+
+import os
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from middleware.metrics import StatsCollector
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Several uvicorn workers: merge the request metrics every worker wrote to the shared
+        # directory, the pool and cache figures are the scraped worker's own
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(StatsCollector())
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -1,38 +1,177 @@
 # controllers/recipes.py
 
-from fastapi import APIRouter, Depends, HTTPException, Security
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Security
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 from models.recipe import RecipeModel
 from models.step import StepModel
 from models.ingredient import IngredientModel
 from models.user import UserModel # import user model
+from models.tag import TagModel, recipe_tags
+from models.search import search_recipes as search_recipes_query
 from serializers.recipe import RecipeSchema, RecipeCreate as RecipeCreateSchema
-from typing import List
+from serializers.ingredient import IngredientSchema
+from serializers.step import StepSchema
+from serializers.user import UserSchema
+from serializers.fast import build_recipes, project_recipe, recipe_children, recipe_columns_for
+from typing import List, Optional
 from models.database import get_db
 from dependencies.get_current_user import get_current_user
+from dependencies.pagination import Page, paginate
+from dependencies.conditional import Conditional, aggregate_state, conditional
+from dependencies.fieldsets import Fieldset, recipe_fieldset
+from cache.recipes import recipe_cache
+from config.environment import export_batch_size
 
 
 router = APIRouter()
 
+# RecipeSchema walks user, ingredients and steps for every recipe, so load the
+# whole graph up front: one JOIN for the user and one SELECT ... IN per child
+# collection, instead of three lazy loads per row.
+recipe_graph = (
+    joinedload(RecipeModel.user),
+    selectinload(RecipeModel.ingredients),
+    selectinload(RecipeModel.steps),
+)
+
+def sparse_recipe_graph(fieldset: Fieldset):
+    """ Like recipe_graph, for just the columns and children a sparse fieldset asked for """
+    options = [load_only(*(getattr(RecipeModel, name) for name in fieldset.fields))]
+    if "user" in fieldset.include:
+        options.append(joinedload(RecipeModel.user).load_only(*(getattr(UserModel, name) for name in UserSchema.model_fields)))
+    options += [selectinload(getattr(RecipeModel, name)) for name in ("ingredients", "steps") if name in fieldset.include]
+    return options
+
+def recipe_rows(fieldset: Fieldset, start=select):
+    """ A select() (or, with start=db.query, a query) for the fieldset's columns of the recipes in a list """
+    rows = start(*recipe_columns_for(fieldset.fields, fieldset.include))
+    # an outer join: user_id is nullable, and a recipe without one is still in the list (with user null)
+    return rows.outerjoin(RecipeModel.user) if "user" in fieldset.include else rows
+
+def recipes_state():
+    """ Validator columns for recipe lists, which embed every table's rows """
+    return (*aggregate_state(RecipeModel), *aggregate_state(IngredientModel),
+            *aggregate_state(StepModel), *aggregate_state(UserModel))
+
+def recipe_state(recipe_id: int):
+    """ Validator columns for one recipe: its own row, its user's and its children's """
+    return (
+        select(RecipeModel.updated_at).where(RecipeModel.id == recipe_id).scalar_subquery(),
+        select(UserModel.updated_at).join(RecipeModel, RecipeModel.user_id == UserModel.id)
+            .where(RecipeModel.id == recipe_id).scalar_subquery(),
+        *aggregate_state(IngredientModel, IngredientModel.recipe_id == recipe_id),
+        *aggregate_state(StepModel, StepModel.recipe_id == recipe_id),
+    )
+
+def recipe_entry(recipe: RecipeModel, state):
+    """ A recipe loaded with recipe_graph, serialized the way recipe_cache keeps it """
+    return RecipeSchema.model_validate(recipe, from_attributes=True).model_dump_json(), tuple(state)
+
+def cache_recipe(recipe: RecipeModel, state):
+    """ Serialize a recipe loaded with recipe_graph and keep it in recipe_cache """
+    cached = recipe_entry(recipe, state)
+    recipe_cache.set(recipe.id, cached)
+    return cached
+
+def cached_recipe_response(cached, validators: Conditional, cache_status: str):
+    # The payload is already JSON, send it as it is instead of through response_model again
+    payload, state = cached
+    not_modified = validators.not_modified(state)
+    if not_modified:
+        return not_modified
+    return Response(payload, media_type="application/json", headers={**validators.headers, "X-Cache": cache_status})
+
 @router.get("/recipes", response_model=List[RecipeSchema])
-def get_recipes(db: Session = Depends(get_db)):
-    recipes = db.query(RecipeModel).all()  
+def get_recipes(tag: Optional[str] = None, db: Session = Depends(get_db), page: Page = Depends(paginate),
+                validators: Conditional = Depends(conditional), fieldset: Fieldset = Depends(recipe_fieldset)):
+    not_modified = validators.not_modified(db.execute(select(*recipes_state())).one())
+    if not_modified:
+        return not_modified
+
+    # Plain column rows rather than RecipeModels (see serializers/fast.py), narrowed to the requested fields
+    query = recipe_rows(fieldset, db.query)
+    if tag:
+        # tags.name -> recipe_tags (tag_id, recipe_id), both index lookups
+        tagged = select(recipe_tags.c.recipe_id).join(TagModel).where(TagModel.name == tag.strip().lower())
+        query = query.filter(RecipeModel.id.in_(tagged))
+    rows = page.apply(query, RecipeModel.id)
+
+    children = {}
+    if rows:
+        children = {name: db.execute(statement).all()
+                    for name, statement in recipe_children([row.id for row in rows], fieldset.include).items()}
+    # Already in RecipeSchema's shape, so skip response_model and send the paging and validator headers along
+    recipes = build_recipes(rows, children, fieldset.fields, fieldset.include)
+    return ORJSONResponse(recipes, headers=page.response.headers)
+
+@router.get("/recipes/export")
+def export_recipes(db: Session = Depends(get_db)):
+    # Stream the whole catalogue as newline-delimited JSON. yield_per reads the
+    # recipes through a server-side cursor in batches (each batch gets its own
+    # selectinload for the children), so memory stays flat however many exist.
+    def generate():
+        recipes = db.query(RecipeModel).options(*recipe_graph).order_by(RecipeModel.id).yield_per(export_batch_size)
+        for recipe in recipes:
+            yield RecipeSchema.model_validate(recipe, from_attributes=True).model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/recipes/search", response_model=List[RecipeSchema])
+def search_recipes(q: str = Query(..., min_length=1, max_length=200), db: Session = Depends(get_db), page: Page = Depends(paginate)):
+    # Ranked full-text search over title, cuisine tags, notes and ingredient names, best matches first
+    query, rank = search_recipes_query(db.query(RecipeModel).options(*recipe_graph), db.get_bind().dialect.name, q)
+    recipes = page.apply_ranked(query, rank, RecipeModel.id)
     return recipes
 
 @router.get("/recipes/{recipe_id}", response_model=RecipeSchema)
-def get_single_recipe(recipe_id: int, db: Session = Depends(get_db)):
-    recipe = db.query(RecipeModel).filter(RecipeModel.id == recipe_id).first()
+def get_single_recipe(recipe_id: int, db: Session = Depends(get_db), validators: Conditional = Depends(conditional),
+                      fieldset: Fieldset = Depends(recipe_fieldset)):
+    # Only the full representation is cached
+    cached = None if fieldset.sparse else recipe_cache.get(recipe_id)
+    if cached is not None:
+        return cached_recipe_response(cached, validators, "HIT")
+
+    state = db.execute(select(*recipe_state(recipe_id))).one()
+    if state[0] is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    not_modified = validators.not_modified(state)
+    if not_modified:
+        return not_modified
+
+    if fieldset.sparse:
+        recipe = db.query(RecipeModel).options(*sparse_recipe_graph(fieldset)).filter(RecipeModel.id == recipe_id).first()
+        if not recipe:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        return ORJSONResponse(project_recipe(recipe, fieldset.fields, fieldset.include), headers=validators.headers)
+
+    recipe = db.query(RecipeModel).options(*recipe_graph).filter(RecipeModel.id == recipe_id).first()
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
-    return recipe
+    return cached_recipe_response(cache_recipe(recipe, state), validators, "MISS")
 
 @router.post("/recipes", response_model=RecipeSchema)
 def create_recipe(recipe: RecipeCreateSchema, db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
-    new_recipe = RecipeModel(**recipe.dict(), user_id=current_user.id)
+    recipe_data = recipe.dict(exclude={"ingredients", "steps"})
+    new_recipe = RecipeModel(**recipe_data, user_id=current_user.id)
+    # The cascade on RecipeModel's relationships inserts the children along with the recipe
+    new_recipe.ingredients = [IngredientModel(**ingredient.dict()) for ingredient in recipe.ingredients]
+    new_recipe.steps = [StepModel(**step.dict()) for step in recipe.steps]
     db.add(new_recipe)
+    db.flush()
+
+    # Everything the response needs is already in memory after the flush, so build it
+    # before commit expires the rows instead of refreshing (and lazy loading) them
+    created = RecipeSchema(
+        id=new_recipe.id,
+        **recipe_data,
+        user=UserSchema.model_validate(current_user, from_attributes=True),
+        ingredients=[IngredientSchema.model_validate(ingredient, from_attributes=True) for ingredient in new_recipe.ingredients],
+        steps=[StepSchema.model_validate(step, from_attributes=True) for step in new_recipe.steps],
+    )
     db.commit()
-    db.refresh(new_recipe)
-    return new_recipe
+    return created
 
 @router.put("/recipes/{recipe_id}", response_model=RecipeSchema)
 def update_recipe(recipe_id: int, recipe: RecipeSchema, db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
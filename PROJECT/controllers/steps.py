@@ -1,22 +1,32 @@
 # controllers/steps.py
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.orm import Session, aliased
 from models.step import StepModel
 #from models.step import StepModel
-from serializers.step import StepSchema
+from serializers.fast import rows_to_dicts, step_columns
+from serializers.step import StepSchema, StepMove
 from typing import List
 from models.database import get_db
 from models.user import UserModel # import user model
 from dependencies.get_current_user import get_current_user
+from dependencies.pagination import Page, paginate
+from cache.recipes import evict_recipes
+from dependencies.conditional import Conditional, aggregate_state, conditional
 from models.recipe import RecipeModel
 
 router = APIRouter()
 
 @router.get("/steps", response_model=List[StepSchema])
-def get_steps(db: Session = Depends(get_db)):
-    steps = db.query(StepModel).all()  
-    return steps
+def get_steps(db: Session = Depends(get_db), page: Page = Depends(paginate), validators: Conditional = Depends(conditional)):
+    not_modified = validators.not_modified(db.execute(select(*aggregate_state(StepModel))).one())
+    if not_modified:
+        return not_modified
+
+    rows = page.apply(db.query(*step_columns), StepModel.id)
+    return ORJSONResponse(rows_to_dicts(rows), headers=page.response.headers)
 
 @router.post("/steps", response_model=StepSchema)
 def create_step(step: StepSchema, db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
@@ -32,6 +42,87 @@ def create_step(step: StepSchema, db: Session = Depends(get_db), current_user: U
     db.refresh(new_step)
     return new_step
 
+@router.post("/steps/bulk", response_model=List[StepSchema])
+def create_steps_bulk(steps: List[StepSchema], db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
+    # Load every recipe the rows point at in one query and check ownership once for the whole batch
+    recipe_ids = {step.recipe_id for step in steps}
+    db_recipes = db.query(RecipeModel).filter(RecipeModel.id.in_(recipe_ids)).all() if recipe_ids else []
+    if len(db_recipes) != len(recipe_ids):
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    # Only the recipe's creator may add to it
+    if any(db_recipe.user_id != current_user.id for db_recipe in db_recipes):
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    new_steps = [StepModel(**step.dict()) for step in steps]
+    db.add_all(new_steps)
+    # flush assigns the ids, so the response can be built before commit expires the rows
+    db.flush()
+    created = [StepSchema.model_validate(step, from_attributes=True) for step in new_steps]
+    db.commit()
+    return created
+
+def move_step_statement(recipe_id: int, step_id: int, old_position: int, new_position: int):
+    # Nothing keeps a recipe's step_orders dense (clients send any value, and duplicates), so
+    # work on positions: ROW_NUMBER() over (step_order, id) numbers the steps 1..n. One
+    # UPDATE writes them back with the moved step in its new place and the steps between its
+    # old and new place shifted by one towards the gap it left. Rows that keep their value
+    # aren't touched.
+    numbered = (
+        select(StepModel.id, func.row_number().over(order_by=(StepModel.step_order, StepModel.id)).label("step_position"))
+        .where(StepModel.recipe_id == recipe_id)
+        .subquery()
+    )
+    shift = 1 if new_position < old_position else -1
+    step_order = case(
+        (StepModel.id == step_id, new_position),
+        (numbered.c.step_position.between(min(old_position, new_position), max(old_position, new_position)),
+         numbered.c.step_position + shift),
+        else_=numbered.c.step_position,
+    )
+    return (
+        update(StepModel)
+        .where(StepModel.id == numbered.c.id, StepModel.step_order != step_order)
+        .values(step_order=step_order, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+def step_position():
+    """ Where the selected step comes in its recipe, 1..n in (step_order, id) order, as a correlated subquery """
+    siblings = aliased(StepModel)
+    before = or_(siblings.step_order < StepModel.step_order,
+                 and_(siblings.step_order == StepModel.step_order, siblings.id <= StepModel.id))
+    return select(func.count()).select_from(siblings).where(siblings.recipe_id == StepModel.recipe_id, before).scalar_subquery()
+
+def step_count():
+    """ How many steps the selected step's recipe has, a correlated subquery to select along with the step """
+    siblings = aliased(StepModel)
+    return select(func.count()).select_from(siblings).where(siblings.recipe_id == StepModel.recipe_id).scalar_subquery()
+
+def step_move_columns():
+    """ The step's recipe, owner, position and step count, what a move needs to know up front """
+    return (StepModel.recipe_id, RecipeModel.user_id, step_position().label("position"), step_count().label("step_count"))
+
+@router.put("/steps/{step_id}/move", response_model=List[StepSchema])
+def move_step(step_id: int, move: StepMove, db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
+    # find the step, who owns its recipe, where it comes and how many steps there are in one query
+    row = db.query(*step_move_columns()).join(RecipeModel).filter(StepModel.id == step_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Step not found")
+    if row.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Operation forbidden")
+
+    # step_order is the position to move to, past the end means last place
+    position = min(move.step_order, row.step_count)
+    if position != row.position:
+        db.execute(move_step_statement(row.recipe_id, step_id, row.position, position))
+        db.commit()
+        # a Core UPDATE, so the session's flush events never see it
+        evict_recipes([row.recipe_id])
+
+    # Hand back the recipe's steps in their new order
+    steps = db.query(StepModel).filter(StepModel.recipe_id == row.recipe_id).order_by(StepModel.step_order, StepModel.id).all()
+    return steps
+
 @router.put("/steps/{step_id}", response_model=StepSchema)
 def update_step(step_id: int, step: StepSchema, db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
     # find the step to update
@@ -0,0 +1,25 @@
+# controllers/tags.py
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.tag import TagModel, recipe_tags
+from serializers.tag import TagCountSchema
+from typing import List
+from models.database import get_db
+
+router = APIRouter()
+
+@router.get("/tags", response_model=List[TagCountSchema])
+def get_tags(db: Session = Depends(get_db)):
+    # Every tag with the number of recipes that carry it, most used first. The counts
+    # come straight off the (tag_id, recipe_id) index without touching recipes.
+    recipe_count = func.count(recipe_tags.c.recipe_id)
+    tags = (
+        db.query(TagModel.name, recipe_count.label("count"))
+        .join(recipe_tags, recipe_tags.c.tag_id == TagModel.id)
+        .group_by(TagModel.id, TagModel.name)
+        .order_by(recipe_count.desc(), TagModel.name)
+        .all()
+    )
+    return tags
@@ -0,0 +1,205 @@
+# data/loader.py
+#
+# Bulk loader for seed data. Rows go in as Core INSERT batches, one executemany per
+# batch instead of one ORM flush per object, or through COPY on Postgres (psycopg2).
+# Given a key, rows that already exist are updated in place (INSERT .. ON CONFLICT),
+# so a database can be re-seeded without dropping its tables.
+
+import io
+import time
+from itertools import islice
+from sqlalchemy import Column, Integer, MetaData, Table, delete, func, insert, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from models.tag import TagModel, recipe_tags, split_tags
+from models.recipe import RecipeModel
+
+BATCH_SIZE = 1000
+
+
+class LoadStats:
+
+    def __init__(self, table: str):
+        self.table = table
+        self.rows = 0
+        self.seconds = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return f"{self.table:<14} {self.rows:>10,} rows {self.seconds:>9.2f}s {self.rate:>12,.0f} rows/s"
+
+
+def report(stats):
+    """ Print one line per table and the total """
+    total = LoadStats("total")
+    for table_stats in stats:
+        print(table_stats)
+        total.rows += table_stats.rows
+        total.seconds += table_stats.seconds
+    print(total)
+
+
+def instance_rows(instances):
+    """ The column values of ORM instances built for add_all. Every instance needs its id, the loads upsert on it """
+    for instance in instances:
+        row = {}
+        for attribute in inspect(instance).mapper.column_attrs:
+            column = attribute.columns[0]
+            value = getattr(instance, attribute.key)
+            if value is None and column.primary_key:
+                # Numbering rows by position would let a reordered list overwrite other rows
+                # (and repoint the foreign keys that refer to them) on the next seed
+                raise ValueError(f"{instance!r} has no {column.key}, seed rows need explicit ids")
+            elif value is None and (column.default is not None or column.server_default is not None):
+                continue  # created_at and friends, left to the INSERT
+            row[column.key] = value
+        yield row
+
+
+def batched(rows, size: int):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def insert_statement(dialect: str, table: Table, columns, key=None):
+    """ INSERT into table, updating the other columns of rows whose key columns already exist """
+    if not key:
+        return insert(table)
+    if dialect == "postgresql":
+        statement = postgresql.insert(table)
+    elif dialect == "sqlite":
+        statement = sqlite.insert(table)
+    else:
+        raise ValueError(f"Upserts aren't supported on {dialect}")
+    updates = {name: statement.excluded[name] for name in columns if name not in key}
+    if updates and "updated_at" in table.c and "updated_at" not in updates:
+        updates["updated_at"] = func.now()
+    if not updates:
+        return statement.on_conflict_do_nothing(index_elements=key)
+    return statement.on_conflict_do_update(index_elements=key, set_=updates)
+
+
+def load(connection, table, rows, key=None, batch_size: int = BATCH_SIZE, copy: bool = True,
+         commit_every: int = None) -> LoadStats:
+    """ Insert rows (dicts of column values, the same keys in every row) into a table or model's table,
+    committing every commit_every batches when it's given (the connection must not be inside begin()) """
+    table = getattr(table, "__table__", table)
+    dialect = connection.dialect.name
+    stats = LoadStats(table.name)
+    start = time.perf_counter()
+
+    use_copy = copy and dialect == "postgresql" and _can_copy(connection)
+    staging = None
+    loaded_columns = set()
+    for batches, batch in enumerate(batched(rows, batch_size), 1):
+        columns = list(batch[0])
+        loaded_columns.update(columns)
+        if use_copy:
+            staging = staging if staging is not None else _staging_table(connection, table)
+            _copy_batch(connection, table, staging, batch, columns, key)
+        else:
+            connection.execute(insert_statement(dialect, table, columns, key), batch)
+        stats.rows += len(batch)
+        _maybe_commit(connection, batches, commit_every)
+    if staging is not None:
+        staging.drop(connection)
+
+    if dialect == "postgresql":
+        _reset_sequence(connection, table, loaded_columns)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def _maybe_commit(connection, batches: int, commit_every):
+    # The temporary staging table outlives the commit, it's only dropped with the connection
+    if commit_every and batches % commit_every == 0:
+        connection.commit()
+
+
+def _can_copy(connection) -> bool:
+    # psycopg2's cursors have copy_expert, other drivers go through executemany
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        return hasattr(cursor, "copy_expert")
+    finally:
+        cursor.close()
+
+def _staging_table(connection, table: Table) -> Table:
+    # COPY can't resolve conflicts or fill in created_at, so it fills a temporary table
+    # that INSERT .. SELECT moves into the real one
+    staging = Table(f"{table.name}_load", MetaData(), *(Column(column.name, column.type) for column in table.columns),
+                    prefixes=["TEMPORARY"])
+    staging.create(connection)
+    return staging
+
+def _copy_value(value) -> str:
+    # COPY's text format: tab separated, \N for NULL, backslash escapes
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def _copy_batch(connection, table: Table, staging: Table, batch, columns, key):
+    buffer = io.StringIO()
+    for row in batch:
+        buffer.write("\t".join(_copy_value(row[name]) for name in columns) + "\n")
+    buffer.seek(0)
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+    statement = insert_statement("postgresql", table, columns, key)
+    connection.execute(statement.from_select(columns, select(*(staging.c[name] for name in columns))))
+    connection.execute(delete(staging))
+
+def _reset_sequence(connection, table: Table, loaded_columns):
+    # Rows loaded with their own ids leave the id sequence behind, the next ORM insert would collide
+    for column in table.primary_key.columns:
+        if column.name in loaded_columns and isinstance(column.type, Integer) and column.autoincrement:
+            sequence = func.pg_get_serial_sequence(table.name, column.name)
+            # is_called false on an empty table, so the next id is 1 rather than 2
+            last_id = func.max(column)
+            connection.execute(select(func.setval(sequence, func.coalesce(last_id, 1), last_id.is_not(None))).select_from(table))
+
+
+def load_tags(connection, batch_size: int = BATCH_SIZE, commit_every: int = None) -> LoadStats:
+    """ The before_flush tag sync for recipes loaded with Core: rebuild recipe_tags from cuisine_tags """
+    dialect = connection.dialect.name
+    stats = LoadStats(recipe_tags.name)
+    start = time.perf_counter()
+
+    recipes = RecipeModel.__table__
+    last_id = 0
+    batches = 0
+    while True:
+        batch = connection.execute(
+            select(recipes.c.id, recipes.c.cuisine_tags)
+            .where(recipes.c.id > last_id).order_by(recipes.c.id).limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        wanted = {recipe.id: split_tags(recipe.cuisine_tags) for recipe in batch}
+        names = sorted({name for recipe_names in wanted.values() for name in recipe_names})
+        if names:
+            connection.execute(insert_statement(dialect, TagModel.__table__, ["name"], ["name"]),
+                               [{"name": name} for name in names])
+        tag_ids = dict(connection.execute(select(TagModel.name, TagModel.id).where(TagModel.name.in_(names))).all()) \
+            if names else {}
+
+        connection.execute(delete(recipe_tags).where(recipe_tags.c.recipe_id.in_(list(wanted))))
+        links = [{"recipe_id": recipe_id, "tag_id": tag_ids[name]}
+                 for recipe_id, recipe_names in wanted.items() for name in recipe_names]
+        if links:
+            connection.execute(insert(recipe_tags), links)
+        stats.rows += len(links)
+        batches += 1
+        _maybe_commit(connection, batches, commit_every)
+
+    stats.seconds = time.perf_counter() - start
+    return stats
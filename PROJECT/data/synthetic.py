@@ -0,0 +1,117 @@
+# data/synthetic.py
+#
+# Synthetic catalogue for load and performance work. Everything is drawn from
+# random.Random streams seeded from one seed, so a seed and a size always give the
+# same rows. Rows are generated lazily as dicts for data/loader.py, memory use stays
+# flat whether it's 1k or 10M recipes.
+#
+# The shapes follow what real catalogues look like: a few users own most recipes,
+# ingredient and step counts are long-tailed around 8 and 6 per recipe, and a
+# handful of tags ("italian", "quick") are on far more recipes than the rest.
+
+import random
+from itertools import count
+
+CUISINES = ["italian", "mexican", "american", "chinese", "indian", "french", "japanese", "thai", "greek",
+            "spanish", "korean", "vietnamese", "middle eastern", "moroccan", "caribbean", "german", "brazilian",
+            "ethiopian", "turkish", "peruvian"]
+DESCRIPTORS = ["quick", "vegetarian", "pasta", "spicy", "comfort food", "healthy", "weeknight", "baking",
+               "gluten free", "one pot", "grilling", "vegan", "kid friendly", "seafood", "slow cooker", "make ahead",
+               "holiday", "dairy free", "low carb", "budget", "brunch", "party", "summer", "winter", "meal prep"]
+TAGS = CUISINES + DESCRIPTORS
+# Zipf-like: the n-th most common tag turns up about 1/n as often as the first
+TAG_WEIGHTS = [1 / rank for rank in range(1, len(TAGS) + 1)]
+
+RECIPE_TYPES = ["entree", "side", "dessert", "breakfast", "soup", "salad", "snack"]
+RECIPE_TYPE_WEIGHTS = [40, 15, 15, 10, 8, 8, 4]
+SERVES = [1, 2, 4, 6, 8, 10, 12]
+SERVES_WEIGHTS = [5, 30, 35, 15, 10, 3, 2]
+
+ADJECTIVES = ["Smoky", "Crispy", "Creamy", "Spicy", "Lemony", "Garlicky", "Roasted", "Braised", "Grilled",
+              "Honey", "Herbed", "Sticky", "Golden", "Rustic", "Charred", "Zesty"]
+MAINS = ["Chicken", "Beef", "Pork", "Salmon", "Shrimp", "Tofu", "Mushroom", "Lentil", "Chickpea", "Lamb",
+         "Eggplant", "Cauliflower", "Turkey", "Cod", "Sweet Potato", "Veal"]
+DISHES = ["Tacos", "Curry", "Stew", "Pasta", "Stir Fry", "Salad", "Soup", "Bowl", "Skewers", "Casserole",
+          "Risotto", "Sandwich", "Pie", "Noodles", "Bake", "Piccata"]
+
+PANTRY = ["Salt", "Black pepper", "Olive oil", "Garlic", "Onion", "Butter", "All purpose flour", "Sugar", "Eggs",
+          "Lemon juice", "Chicken stock", "Tomatoes", "Parsley", "Cumin", "Paprika", "Soy sauce", "Milk", "Rice",
+          "Carrots", "Celery", "Ginger", "Cilantro", "Honey", "Parmesan", "Heavy cream", "Chili flakes", "Basil",
+          "Thyme", "Bell pepper", "Potatoes", "Vinegar", "Brown sugar", "Lime juice", "Coconut milk", "Oregano",
+          "Cheddar", "Spinach", "Capers", "White wine", "Baking powder"]
+PANTRY_WEIGHTS = [1 / rank for rank in range(1, len(PANTRY) + 1)]
+QUANTITIES = ["To taste", "1 pinch", "1 teaspoon", "2 teaspoons", "1 tablespoon", "2 tablespoons", "1/4 cup",
+              "1/2 cup", "1 cup", "2 cups", "1lb", "2lb", "1 can", "3 cloves", "1 bunch"]
+STEP_VERBS = ["Chop", "Whisk", "Simmer", "Stir in", "Season", "Roast", "Fold in", "Saute", "Bring to a boil",
+              "Drain", "Toss", "Bake", "Rest", "Sprinkle", "Reduce"]
+NOTES = ["Keeps for 3 days in the fridge.", "Freezes well.", "Best served the same day.",
+         "Double the sauce for leftovers.", "Swap the protein for whatever is on hand."]
+
+SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_scale(value: str) -> int:
+    """ "1k" -> 1000, "10M" -> 10000000, "250" -> 250 """
+    value = value.strip().lower().replace("_", "")
+    multiplier = SUFFIXES.get(value[-1:], 1)
+    number = value[:-1] if value[-1:] in SUFFIXES else value
+    return int(float(number) * multiplier)
+
+
+def long_tail(rng: random.Random, median: float, low: int, high: int) -> int:
+    """ A count that's usually near median with a long right tail (lognormal), kept within low..high """
+    return max(low, min(high, round(rng.lognormvariate(0, 0.45) * median)))
+
+
+class Catalogue:
+    # Row streams for one synthetic catalogue. Each table draws from its own
+    # stream, so reading them in any order (or only some of them) gives the same rows.
+
+    def __init__(self, recipes: int, seed: int = 0, users: int = None):
+        self.recipes = recipes
+        self.users = users if users is not None else max(1, recipes // 10)
+        self.seed = seed
+
+    def _random(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def user_rows(self):
+        for user_id in range(1, self.users + 1):
+            yield {"id": user_id, "username": f"cook{user_id}", "email": f"cook{user_id}@example.com"}
+
+    def recipe_rows(self):
+        rng = self._random("recipes")
+        for recipe_id in range(1, self.recipes + 1):
+            tags = list(dict.fromkeys(rng.choices(TAGS, weights=TAG_WEIGHTS, k=rng.randint(1, 4))))
+            yield {
+                "id": recipe_id,
+                # the id keeps titles unique, they're a unique column
+                "title": f"{rng.choice(ADJECTIVES)} {rng.choice(MAINS)} {rng.choice(DISHES)} {recipe_id}",
+                "recipe_type": rng.choices(RECIPE_TYPES, weights=RECIPE_TYPE_WEIGHTS)[0],
+                "cuisine_tags": ", ".join(tags),
+                "serves": rng.choices(SERVES, weights=SERVES_WEIGHTS)[0],
+                "notes": rng.choice(NOTES) if rng.random() < 0.4 else "",
+                # log-uniform owner: user 1 owns the most, most users own one or two
+                "user_id": max(1, int(self.users ** rng.random())),
+            }
+
+    def ingredient_rows(self):
+        rng = self._random("ingredients")
+        ids = count(1)
+        for recipe_id in range(1, self.recipes + 1):
+            # repeated draws (salt, salt) are dropped, which brings the median down to about 8
+            names = rng.choices(PANTRY, weights=PANTRY_WEIGHTS, k=long_tail(rng, 10, 2, 30))
+            for name in dict.fromkeys(names):
+                yield {"id": next(ids), "name": name, "quantity": rng.choice(QUANTITIES), "recipe_id": recipe_id}
+
+    def step_rows(self):
+        rng = self._random("steps")
+        ids = count(1)
+        for recipe_id in range(1, self.recipes + 1):
+            for step_order in range(1, long_tail(rng, 6, 1, 25) + 1):
+                yield {
+                    "id": next(ids),
+                    "step_order": step_order,
+                    "step_details": f"{rng.choice(STEP_VERBS)}, then cook for {rng.randint(1, 12) * 5} minutes.",
+                    "recipe_id": recipe_id,
+                }
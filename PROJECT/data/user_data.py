@@ -1,9 +1,10 @@
 from models.user import UserModel
 
+# Explicit ids, like data/recipe_data.py: the recipes' user_id refers to them
 user_list = [
-    UserModel(username="nick123", email="nick@nick.com"),
-    UserModel(username="charles", email="charles@charles.com"),
-    UserModel(username="adam1Aa", email="adam@adam.com"),
-    UserModel(username="joe", email="joe@adam.com"),
-    UserModel(username="cliff", email="cliff@adam.com")
+    UserModel(id=1, username="nick123", email="nick@nick.com"),
+    UserModel(id=2, username="charles", email="charles@charles.com"),
+    UserModel(id=3, username="adam1Aa", email="adam@adam.com"),
+    UserModel(id=4, username="joe", email="joe@adam.com"),
+    UserModel(id=5, username="cliff", email="cliff@adam.com")
 ]
\ No newline at end of file
@@ -0,0 +1,41 @@
+# dependencies/fieldsets.py
+from typing import Optional
+from fastapi import HTTPException, Query, status
+from serializers.fast import RECIPE_FIELDS, RECIPE_NESTED
+
+
+def parse_names(value: Optional[str], allowed, kind: str):
+    if value is None:
+        return allowed
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unknown {kind}: {', '.join(unknown)}")
+    # Keep the schema's order whatever order the client listed them in
+    return tuple(name for name in allowed if name in names)
+
+
+class Fieldset:
+    # Sparse fieldsets: the client names the recipe fields and nested objects it
+    # wants, and only those are SELECTed, loaded and serialized.
+
+    def __init__(self, fields, include):
+        self.fields = fields
+        self.include = include
+
+    @property
+    def sparse(self) -> bool:
+        """ Whether anything was left out of the full RecipeSchema """
+        return self.fields != RECIPE_FIELDS or self.include != RECIPE_NESTED
+
+
+def recipe_fieldset(fields: Optional[str] = Query(None, description="Comma separated recipe fields to return, "
+                                                                    "all of them when left out (id is always returned)"),
+                    include: Optional[str] = Query(None, description="Comma separated nested objects to return "
+                                                                     "(user, ingredients, steps), all of them when left out")):
+    # This function is a dependency that reads the fields and include query parameters for recipe reads
+    fields = parse_names(fields, RECIPE_FIELDS, "field")
+    if "id" not in fields:
+        fields = ("id", *fields)
+    return Fieldset(fields, parse_names(include, RECIPE_NESTED, "include"))
@@ -1,19 +1,36 @@
 # dependencies/get_current_user.py
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from models.user import UserModel
 from models.database import get_db
 import jwt
 from jwt import DecodeError, ExpiredSignatureError # We import specific exceptions to handle them explicitly
-from config.environment import secret
+from config.environment import secret, token_cache_size, token_cache_ttl
+from cache.memory import TTLCache
 
 # We're using HTTP Bearer scheme for Authorization header
 http_bearer = HTTPBearer()
 
+# Clients reuse the same token for many requests, so we remember which user each token
+# belongs to. An entry never outlives the token's own "exp" claim.
+token_cache = TTLCache(maxsize=token_cache_size, ttl=token_cache_ttl)
+
+def snapshot_user(user: UserModel):
+    # A copy of the user's columns that isn't attached to any session, so it can be shared
+    # between requests without holding on to (or lazy loading through) the session that read it
+    return UserModel(id=user.id, username=user.username, email=user.email,
+                     created_at=user.created_at, updated_at=user.updated_at)
+
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_bearer)):
     # This function is a dependency that takes in the database session and the JWT token from the request header
 
+    # If we've already seen this token we can skip both the decode and the database lookup
+    user = token_cache.get(token.credentials)
+    if user is not None:
+        return user
+
     try:
         # We try to decode the token using the secret key
         payload = jwt.decode(token.credentials, secret, algorithms=["HS256"])
@@ -36,5 +53,13 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_be
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                             detail='Token has expired')
 
-    # If everything is successful, we return the user
-    return user
\ No newline at end of file
+    # If everything is successful, we cache and return the user
+    user = snapshot_user(user)
+    token_cache.set(token.credentials, user, expires_at=payload.get("exp"))
+    return user
+
+# Whenever a user row is updated or deleted through the ORM, forget every token that resolved to it
+@event.listens_for(UserModel, "after_update")
+@event.listens_for(UserModel, "after_delete")
+def _forget_user_tokens(mapper, connection, target):
+    token_cache.delete_where(lambda user: user.id == target.id)
@@ -0,0 +1,40 @@
+# dependencies/get_current_user_async.py
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import UserModel
+from models.async_database import get_async_db
+import jwt
+from jwt import DecodeError, ExpiredSignatureError
+from config.environment import secret
+# The async stack shares the sync stack's bearer scheme and token cache
+from dependencies.get_current_user import http_bearer, token_cache, snapshot_user
+
+async def get_current_user_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(http_bearer)):
+    # The same checks as get_current_user, awaiting the user lookup instead of blocking a thread on it
+
+    user = token_cache.get(token.credentials)
+    if user is not None:
+        return user
+
+    try:
+        payload = jwt.decode(token.credentials, secret, algorithms=["HS256"])
+
+        result = await db.execute(select(UserModel).where(UserModel.id == payload.get("sub")))
+        user = result.scalars().first()
+
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                                detail="Invalid username or password")
+
+    except DecodeError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail=f'Could not decode token: {str(e)}')
+
+    except ExpiredSignatureError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail='Token has expired')
+
+    user = snapshot_user(user)
+    token_cache.set(token.credentials, user, expires_at=payload.get("exp"))
+    return user
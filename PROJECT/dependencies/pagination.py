@@ -0,0 +1,111 @@
+# dependencies/pagination.py
+import base64
+import binascii
+import json
+from typing import Optional
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, func, or_, select
+from config.environment import default_page_size, max_page_size
+
+
+def encode_cursor(last_id: int, rank: Optional[float] = None) -> str:
+    # The cursor is opaque to clients, they just hand back whatever we gave them
+    position = {"id": last_id} if rank is None else {"id": last_id, "rank": rank}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        last_id, rank = position["id"], position.get("rank")
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if not isinstance(last_id, int) or not isinstance(rank, (int, float, type(None))):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return {"id": last_id, "rank": rank}
+
+
+class Page:
+    # Keyset pagination on the primary key: every page is "WHERE id > :last_id
+    # ORDER BY id LIMIT :limit", which stays an index range scan however deep
+    # the client pages, unlike OFFSET.
+
+    def __init__(self, response: Response, limit: int, after: Optional[dict], with_total: bool):
+        self.response = response
+        self.limit = limit
+        self.after = after["id"] if after else None
+        self.after_rank = after["rank"] if after else None
+        self.with_total = with_total
+
+    def apply(self, query, id_column):
+        """ Run the query for the requested page and set the paging headers """
+        if self.with_total:
+            self.response.headers["X-Total-Count"] = str(query.order_by(None).count())
+
+        if self.after is not None:
+            query = query.filter(id_column > self.after)
+
+        # Fetch one extra row to find out whether there is a next page
+        rows = query.order_by(id_column).limit(self.limit + 1).all()
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            self.response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].id)
+        return rows
+
+    def ranked(self, query, rank, id_column):
+        """ The query for the requested page of results ordered by a relevance rank (best first) and then id """
+        if self.after is not None:
+            if self.after_rank is None:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+            # The cursor remembers the last row's rank as well as its id, so the next page
+            # starts right after it in (rank DESC, id) order
+            query = query.filter(or_(rank < self.after_rank, and_(rank == self.after_rank, id_column > self.after)))
+        return query.add_columns(rank).order_by(rank.desc(), id_column).limit(self.limit + 1)
+
+    def apply_ranked(self, query, rank, id_column):
+        """ Like apply, for results ordered by a relevance rank (best first) and then id """
+        if self.with_total:
+            self.response.headers["X-Total-Count"] = str(query.order_by(None).count())
+
+        return self._ranked_page(self.ranked(query, rank, id_column).all())
+
+    async def apply_ranked_async(self, db, statement, rank, id_column):
+        """ The same as apply_ranked, for a select() run on an AsyncSession """
+        if self.with_total:
+            count = select(func.count()).select_from(statement.order_by(None).subquery())
+            self.response.headers["X-Total-Count"] = str(await db.scalar(count))
+
+        result = await db.execute(self.ranked(statement, rank, id_column))
+        return self._ranked_page(result.unique().all())
+
+    def _ranked_page(self, rows):
+        # (row, rank) pairs, one more than the limit if there is a next page
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last, last_rank = rows[-1]
+            self.response.headers["X-Next-Cursor"] = encode_cursor(last.id, last_rank)
+        return [row[0] for row in rows]
+
+    async def apply_async(self, db, statement, id_column, scalars: bool = True):
+        """ The same as apply, for a select() run on an AsyncSession (scalars=False for column rows) """
+        if self.with_total:
+            count = select(func.count()).select_from(statement.order_by(None).subquery())
+            self.response.headers["X-Total-Count"] = str(await db.scalar(count))
+
+        if self.after is not None:
+            statement = statement.where(id_column > self.after)
+
+        result = await db.execute(statement.order_by(id_column).limit(self.limit + 1))
+        rows = (result.scalars() if scalars else result).unique().all()
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            self.response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].id)
+        return rows
+
+
+def paginate(response: Response,
+             limit: int = Query(default_page_size, ge=1, le=max_page_size),
+             cursor: Optional[str] = None,
+             with_total: bool = False):
+    # This function is a dependency that reads the paging query parameters for collection endpoints
+    after = decode_cursor(cursor) if cursor else None
+    return Page(response, limit, after, with_total)
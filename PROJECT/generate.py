@@ -0,0 +1,59 @@
+# generate.py
+import argparse
+import sys
+from models.base import Base
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from models import search  # adds the full-text search indexes to create_all
+from data.loader import BATCH_SIZE, load, load_tags, report
+from data.synthetic import Catalogue, parse_scale
+from config.environment import db_URI
+from sqlalchemy import create_engine
+
+parser = argparse.ArgumentParser(description="Fill the recipes database with a synthetic catalogue")
+parser.add_argument("--recipes", default="1k", help="how many recipes: 1000, 1k, 100k, 10M..")
+parser.add_argument("--users", type=parse_scale, default=None, help="how many users (default: a tenth of the recipes)")
+parser.add_argument("--seed", type=int, default=0, help="the same seed and sizes always give the same rows")
+parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per INSERT (or COPY) batch")
+parser.add_argument("--commit-every", type=int, default=100, help="batches per transaction (each table also commits at its end)")
+args = parser.parse_args()
+
+engine = create_engine(db_URI)
+
+# ! Like seed.py, but with as many rows as we ask for. The rows are generated as they're
+# ! inserted and upserted by id, so a run with the same seed and sizes is repeatable.
+# ! The load commits every --commit-every batches rather than in one transaction, so a failure
+# ! keeps what's already committed: rerunning with the same arguments is safe, the upsert by id
+# ! rewrites the loaded rows instead of duplicating them and carries on from there.
+try:
+    if args.reset:
+        print("Recreating database..")
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    catalogue = Catalogue(parse_scale(args.recipes), seed=args.seed, users=args.users)
+    print(f"generating {catalogue.recipes:,} recipes for {catalogue.users:,} users (seed {catalogue.seed})..")
+    tables = [
+        (UserModel, catalogue.user_rows()),
+        (RecipeModel, catalogue.recipe_rows()),
+        (IngredientModel, catalogue.ingredient_rows()),
+        (StepModel, catalogue.step_rows()),
+    ]
+    stats = []
+    with engine.connect() as connection:
+        for model, rows in tables:
+            stats.append(load(connection, model, rows, key=["id"], batch_size=args.batch_size,
+                              commit_every=args.commit_every))
+            connection.commit()
+        stats.append(load_tags(connection, batch_size=args.batch_size, commit_every=args.commit_every))
+        connection.commit()
+    report(stats)
+
+    print("bye 👋")
+except Exception as e:
+    print(e)
+    # a non-zero exit status, so scripts and CI notice the load failed
+    sys.exit(1)
@@ -1,14 +1,30 @@
 from fastapi import FastAPI
-from controllers.recipes import router as RecipesRouter
-from controllers.ingredients import router as IngredientsRouter
-from controllers.steps import router as StepsRouter
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from config.environment import db_URI
-from controllers.users import router as UsersRouter  # Import users router
+from config.environment import db_URI, db_async, gzip_minimum_size, gzip_level
 from models.database import get_db
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+
+# DB_ASYNC switches every router over to the async handlers on the AsyncEngine
+if db_async:
+    from controllers.async_recipes import router as RecipesRouter
+    from controllers.async_ingredients import router as IngredientsRouter
+    from controllers.async_steps import router as StepsRouter
+    from controllers.async_users import router as UsersRouter
+else:
+    from controllers.recipes import router as RecipesRouter
+    from controllers.ingredients import router as IngredientsRouter
+    from controllers.steps import router as StepsRouter
+    from controllers.users import router as UsersRouter  # Import users router
+# The tag facet is one GROUP BY, it stays on the sync stack either way
+from controllers.tags import router as TagsRouter
+from controllers.metrics import router as MetricsRouter
 
 app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=gzip_minimum_size, compresslevel=gzip_level)
+# Added last so it runs outermost and its timings include compression
+app.add_middleware(MetricsMiddleware)
 
 @app.get('/')
 def home():
@@ -18,3 +34,5 @@ app.include_router(RecipesRouter, prefix="/api")
 app.include_router(IngredientsRouter, prefix="/api")
 app.include_router(StepsRouter, prefix="/api")
 app.include_router(UsersRouter, prefix="/api")  # Include users router
+app.include_router(TagsRouter, prefix="/api")
+app.include_router(MetricsRouter)  # GET /metrics, for Prometheus
@@ -0,0 +1,37 @@
+# middleware/compression.py
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Receive, Scope, Send
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """ Whether an Accept-Encoding header allows gzip, by name or through *, with a q-value above 0 """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class CompressionMiddleware(GZipMiddleware):
+    # Starlette's gzip middleware, negotiated properly: it only looks for "gzip"
+    # anywhere in Accept-Encoding, so "gzip;q=0" (gzip refused) would still be
+    # compressed. Responses under minimum_size go out as they are; streamed ones
+    # (like /api/recipes/export) are compressed chunk by chunk as they are sent.
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
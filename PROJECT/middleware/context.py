@@ -0,0 +1,17 @@
+# middleware/context.py
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestStats:
+    # What the engine events learn about the request they run for
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.statements = 0
+        self.db_seconds = 0.0
+
+# The stats of the request being handled. Sync routes run in FastAPI's threadpool with a
+# copy of the request's context, so they still see (and add to) the same RequestStats.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
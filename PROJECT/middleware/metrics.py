@@ -0,0 +1,123 @@
+# middleware/metrics.py
+#
+# Per-request instrumentation, served in Prometheus format on GET /metrics:
+# handler latency by route, how many SQL statements each request ran and how long
+# they took (from engine events on every Engine), connection pool checkout waits,
+# and the connection pool and cache counters.
+
+import time
+from prometheus_client import Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from models.database import TimedQueuePool, engine
+from middleware.context import RequestStats, current_request
+from cache.recipes import recipe_cache
+from dependencies.get_current_user import token_cache
+
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Time spent handling a request, until its last body chunk",
+                            ["method", "route", "status"])
+REQUEST_STATEMENTS = Histogram("http_request_db_statements", "SQL statements run by one request", ["method", "route"],
+                               buckets=(0, 1, 2, 3, 4, 5, 10, 20, 50, 100, 500))
+REQUEST_DB_SECONDS = Histogram("http_request_db_seconds", "Time one request spent in SQL statements", ["method", "route"])
+POOL_WAIT_SECONDS = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+                              buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30))
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["statement_started"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - started
+
+@event.listens_for(Engine, "handle_error")
+def _failed_statement(context):
+    # after_cursor_execute never comes for a statement that raised
+    started = context.connection.info.get("statement_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+def _observe_pool_wait(seconds: float):
+    POOL_WAIT_SECONDS.observe(seconds)
+
+TimedQueuePool.wait_observers.append(_observe_pool_wait)
+
+
+def route_path(scope: Scope) -> str:
+    """ The route template that handles the request ("/api/recipes/{recipe_id}"), keeping the label set small """
+    for route in getattr(scope.get("app"), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    # Times every HTTP request from the moment it arrives until its last body chunk
+    # has been sent, so streamed responses are measured in full.
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope["method"], route_path(scope))
+        token = current_request.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_request.reset(token)
+            method, route = stats.method, stats.route
+            REQUEST_SECONDS.labels(method, route, str(status)).observe(time.perf_counter() - start)
+            REQUEST_STATEMENTS.labels(method, route).observe(stats.statements)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+
+
+class StatsCollector:
+    # Reads the pool's and the caches' own counters whenever /metrics is scraped
+
+    def collect(self):
+        pool = engine.pool
+        if isinstance(pool, TimedQueuePool):
+            stats = pool.stats()
+            for name in ("size", "checked_out", "overflow"):
+                yield GaugeMetricFamily(f"db_pool_{name}", f"Connection pool {name.replace('_', ' ')}", value=stats[name])
+            yield CounterMetricFamily("db_pool_checkouts", "Connections handed out by the pool", value=stats["checkouts"])
+            yield CounterMetricFamily("db_pool_timeouts", "Checkouts that gave up waiting for a connection",
+                                      value=stats["timeouts"])
+            yield GaugeMetricFamily("db_pool_wait_seconds_max", "Longest checkout wait so far",
+                                    value=stats["wait_seconds_max"])
+
+        hits = CounterMetricFamily("cache_hits", "Cache lookups that found an entry", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache lookups that found nothing", labels=["cache"])
+        size = GaugeMetricFamily("cache_entries", "Entries held in this process", labels=["cache"])
+        hit_rate = GaugeMetricFamily("cache_hit_ratio", "Hits over lookups since start", labels=["cache"])
+        for name, cache in (("recipes", recipe_cache), ("tokens", token_cache)):
+            stats = cache.stats()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            size.add_metric([name], stats["size"])
+            hit_rate.add_metric([name], stats["hit_rate"])
+        yield from (hits, misses, size, hit_rate)
+
+REGISTRY.register(StatsCollector())
@@ -0,0 +1,27 @@
+# migrate_indexes.py
+from models.base import Base
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from config.environment import db_URI
+from sqlalchemy import create_engine, inspect
+
+engine = create_engine(db_URI)
+
+# ! create_all only builds indexes along with brand new tables. This adds any index declared
+# ! on the models that an existing database is still missing, and leaves the rest alone.
+try:
+    print("Adding missing indexes..")
+    existing_tables = inspect(engine).get_table_names()
+    for table in Base.metadata.sorted_tables:
+        # Tables that don't exist yet get their indexes from create_all (or seed.py)
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+            print(f"{table.name}: {index.name}")
+
+    print("bye 👋")
+except Exception as e:
+    print(e)
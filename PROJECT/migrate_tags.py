@@ -0,0 +1,47 @@
+# migrate_tags.py
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.recipe import RecipeModel
+from models.tag import TagModel, recipe_tags, sync_tags
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from config.environment import db_URI
+from sqlalchemy import create_engine
+
+engine = create_engine(db_URI)
+SessionLocal = sessionmaker(bind=engine)
+
+BATCH_SIZE = 1000
+
+# ! One-off migration for databases created before tags were their own table. It adds the
+# ! tags and recipe_tags tables (existing tables are left alone) and splits every recipe's
+# ! cuisine_tags string into tag rows. Safe to run more than once.
+try:
+    print("Creating tag tables..")
+    Base.metadata.create_all(bind=engine, tables=[TagModel.__table__, recipe_tags])
+
+    db = SessionLocal()
+    migrated = 0
+    last_id = 0
+    while True:
+        recipes = (
+            db.query(RecipeModel)
+            .filter(RecipeModel.id > last_id)
+            .order_by(RecipeModel.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not recipes:
+            break
+        sync_tags(db, recipes)
+        db.commit()
+        migrated += len(recipes)
+        last_id = recipes[-1].id
+        print(f"{migrated} recipes tagged..")
+        db.expunge_all()
+    db.close()
+
+    print("bye 👋")
+except Exception as e:
+    print(e)
@@ -0,0 +1,35 @@
+# async_database.py
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from .database import slow_query_log
+from config.environment import (async_db_URI, db_pool_size, db_max_overflow, db_pool_timeout,
+                                db_pool_recycle, db_pool_pre_ping, db_statement_timeout_ms)
+
+
+def async_engine_options():
+    """ Keyword arguments for create_async_engine, built from config/environment.py """
+    options = {
+        "pool_size": db_pool_size,
+        "max_overflow": db_max_overflow,
+        "pool_timeout": db_pool_timeout,
+        "pool_recycle": db_pool_recycle,
+        "pool_pre_ping": db_pool_pre_ping,
+    }
+    if async_db_URI.startswith("postgresql+asyncpg") and db_statement_timeout_ms:
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(db_statement_timeout_ms)}}
+    return options
+
+
+# ! Connect the async routers with SQLAlchemy. A request waiting on Postgres only holds
+# ! a coroutine here, not one of the threadpool's threads.
+async_engine = create_async_engine(async_db_URI, **async_engine_options())
+# Rows stay loaded after commit, async sessions can't lazy load them back in
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# The same opt-in slow query log as the sync engine, on the engine behind the async one
+if slow_query_log.threshold_ms:
+    slow_query_log.attach(async_engine.sync_engine)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,16 +1,89 @@
 # database.py
 
-from sqlalchemy import create_engine
+import time
+from threading import Lock
+from sqlalchemy import create_engine, exc
 from sqlalchemy.orm import sessionmaker
-from config.environment import db_URI
+from sqlalchemy.pool import QueuePool
+from config.environment import (db_URI, db_pool_size, db_max_overflow, db_pool_timeout,
+                                db_pool_recycle, db_pool_pre_ping, db_statement_timeout_ms,
+                                slow_query_ms, slow_query_sample_rate, slow_query_explain_analyze)
+from .slow_queries import SlowQueryLog
+
+
+class TimedQueuePool(QueuePool):
+    # A QueuePool that records how long each checkout waited for a free connection,
+    # so the pool can be sized against the number of worker threads. Waits near zero
+    # mean the pool is big enough; growing waits or timeouts mean requests are queuing.
+
+    # Callables given every checkout's wait in seconds (the /metrics middleware adds one)
+    wait_observers = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._stats_lock = Lock()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            for observer in self.wait_observers:
+                observer(waited)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "overflow": self.overflow(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+def engine_options():
+    """ Keyword arguments for create_engine, built from config/environment.py """
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": db_pool_size,
+        "max_overflow": db_max_overflow,
+        "pool_timeout": db_pool_timeout,
+        "pool_recycle": db_pool_recycle,
+        "pool_pre_ping": db_pool_pre_ping,
+    }
+    if db_URI.startswith("postgresql") and db_statement_timeout_ms:
+        options["connect_args"] = {"options": f"-c statement_timeout={db_statement_timeout_ms}"}
+    return options
+
 
 # ! Connect FastAPI with SQLAlchemy
-engine = create_engine(db_URI)
+engine = create_engine(db_URI, **engine_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Opt-in, see models/slow_queries.py
+slow_query_log = SlowQueryLog(slow_query_ms, slow_query_sample_rate, slow_query_explain_analyze)
+if slow_query_ms:
+    slow_query_log.attach(engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
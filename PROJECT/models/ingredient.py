@@ -10,6 +10,6 @@ class IngredientModel(BaseModel):
     name = Column(String, nullable=False)
     quantity = Column(String, nullable=False)
 
-    recipe_id = Column(Integer, ForeignKey('recipes.id'), nullable=False)
+    recipe_id = Column(Integer, ForeignKey('recipes.id'), nullable=False, index=True)
     recipe = relationship("RecipeModel", back_populates="ingredients")  
 
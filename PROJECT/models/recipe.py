@@ -1,12 +1,13 @@
 # models/recipe.py
 
 from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, event, inspect
+from sqlalchemy.orm import relationship, Session
 from .base import BaseModel
 #from models.ingredient import IngredientModel
 from .ingredient import IngredientModel
 from .user import UserModel
+from .tag import TagModel, recipe_tags, sync_tags
 
 class RecipeModel(BaseModel):
     
@@ -20,13 +21,27 @@ class RecipeModel(BaseModel):
     serves = Column(Integer)
     notes = Column(String)
     # Foreign key for User
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
 
   # Many (TeaModel) to One (UserModel) relationship
     user = relationship('UserModel', back_populates='recipes')
     
     ingredients = relationship("IngredientModel", back_populates="recipe", cascade="all, delete-orphan")
-    steps = relationship("StepModel", back_populates="recipe", cascade="all, delete-orphan")
-    
-    
+    # Always in step_order (id breaks ties), read straight off the (recipe_id, step_order) index
+    steps = relationship("StepModel", back_populates="recipe", cascade="all, delete-orphan",
+                         order_by="(StepModel.step_order, StepModel.id)")
+
+    # The same tags as cuisine_tags, as indexed rows we can filter and count on
+    tags = relationship("TagModel", secondary=recipe_tags, back_populates="recipes")
+
 
+# cuisine_tags stays the field clients read and write, the tag rows follow it on every flush
+@event.listens_for(Session, "before_flush")
+def _sync_recipe_tags(session, flush_context, instances):
+    changed = [
+        recipe for recipe in list(session.new) + list(session.dirty)
+        if isinstance(recipe, RecipeModel)
+        and (recipe in session.new or inspect(recipe).attrs.cuisine_tags.history.has_changes())
+    ]
+    if changed:
+        sync_tags(session, changed)
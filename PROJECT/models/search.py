@@ -0,0 +1,106 @@
+# models/search.py
+#
+# Full-text search over recipe titles, cuisine tags, notes and ingredient names.
+#
+# On Postgres the search runs against GIN expression indexes: a tsvector over the
+# recipe's own text, a tsvector over ingredient names and a trigram index on the
+# title for typo-tolerant matches. On SQLite (the test database) an FTS5 table,
+# kept up to date by triggers, stands in for all three.
+
+from sqlalchemy import DDL, Float, case, cast, column, event, false, func, literal, literal_column, or_, select, table
+from .base import Base
+from .recipe import RecipeModel
+from .ingredient import IngredientModel
+
+# The query has to use exactly the expressions the indexes were built on, so both are
+# generated from these templates ({t} is the table prefix, empty inside CREATE INDEX)
+RECIPE_DOCUMENT = ("to_tsvector('english', coalesce({t}title, '') || ' ' || "
+                   "coalesce({t}cuisine_tags, '') || ' ' || coalesce({t}notes, ''))")
+INGREDIENT_DOCUMENT = "to_tsvector('english', {t}name)"
+
+postgres_ddl = [
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+    DDL(f"CREATE INDEX IF NOT EXISTS ix_recipes_search ON recipes USING gin ({RECIPE_DOCUMENT.format(t='')})"),
+    DDL("CREATE INDEX IF NOT EXISTS ix_recipes_title_trgm ON recipes USING gin (title gin_trgm_ops)"),
+    DDL(f"CREATE INDEX IF NOT EXISTS ix_ingredients_search ON ingredients USING gin ({INGREDIENT_DOCUMENT.format(t='')})"),
+]
+
+SQLITE_INGREDIENT_NAMES = "(SELECT group_concat(name, ' ') FROM ingredients WHERE recipe_id = {recipe_id})"
+
+sqlite_ddl = [
+    DDL("CREATE VIRTUAL TABLE IF NOT EXISTS recipe_search "
+        "USING fts5(title, cuisine_tags, notes, ingredients, tokenize='porter unicode61')"),
+    DDL("CREATE TRIGGER IF NOT EXISTS recipes_search_insert AFTER INSERT ON recipes BEGIN "
+        "INSERT INTO recipe_search (rowid, title, cuisine_tags, notes, ingredients) "
+        f"VALUES (new.id, new.title, new.cuisine_tags, new.notes, {SQLITE_INGREDIENT_NAMES.format(recipe_id='new.id')}); "
+        "END"),
+    DDL("CREATE TRIGGER IF NOT EXISTS recipes_search_update AFTER UPDATE ON recipes BEGIN "
+        "DELETE FROM recipe_search WHERE rowid = old.id; "
+        "INSERT INTO recipe_search (rowid, title, cuisine_tags, notes, ingredients) "
+        f"VALUES (new.id, new.title, new.cuisine_tags, new.notes, {SQLITE_INGREDIENT_NAMES.format(recipe_id='new.id')}); "
+        "END"),
+    DDL("CREATE TRIGGER IF NOT EXISTS recipes_search_delete AFTER DELETE ON recipes BEGIN "
+        "DELETE FROM recipe_search WHERE rowid = old.id; "
+        "END"),
+    DDL("CREATE TRIGGER IF NOT EXISTS ingredients_search_insert AFTER INSERT ON ingredients BEGIN "
+        f"UPDATE recipe_search SET ingredients = {SQLITE_INGREDIENT_NAMES.format(recipe_id='new.recipe_id')} "
+        "WHERE rowid = new.recipe_id; "
+        "END"),
+    DDL("CREATE TRIGGER IF NOT EXISTS ingredients_search_update AFTER UPDATE ON ingredients BEGIN "
+        f"UPDATE recipe_search SET ingredients = {SQLITE_INGREDIENT_NAMES.format(recipe_id='old.recipe_id')} "
+        "WHERE rowid = old.recipe_id; "
+        f"UPDATE recipe_search SET ingredients = {SQLITE_INGREDIENT_NAMES.format(recipe_id='new.recipe_id')} "
+        "WHERE rowid = new.recipe_id; "
+        "END"),
+    DDL("CREATE TRIGGER IF NOT EXISTS ingredients_search_delete AFTER DELETE ON ingredients BEGIN "
+        f"UPDATE recipe_search SET ingredients = {SQLITE_INGREDIENT_NAMES.format(recipe_id='old.recipe_id')} "
+        "WHERE rowid = old.recipe_id; "
+        "END"),
+]
+
+for ddl in postgres_ddl:
+    event.listen(Base.metadata, "after_create", ddl.execute_if(dialect="postgresql"))
+for ddl in sqlite_ddl:
+    event.listen(Base.metadata, "after_create", ddl.execute_if(dialect="sqlite"))
+# The triggers go with their tables, the FTS table has to be dropped by hand
+event.listen(Base.metadata, "before_drop", DDL("DROP TABLE IF EXISTS recipe_search").execute_if(dialect="sqlite"))
+
+
+def search_recipes(query, dialect_name: str, text: str):
+    """ Narrow a RecipeModel query to recipes matching text, returns the query and its rank expression """
+    if dialect_name == "postgresql":
+        return _search_postgres(query, text)
+    return _search_sqlite(query, text)
+
+def _search_postgres(query, text):
+    terms = func.plainto_tsquery(literal_column("'english'"), text)
+    document = literal_column(RECIPE_DOCUMENT.format(t="recipes."))
+    ingredient_document = literal_column(INGREDIENT_DOCUMENT.format(t="ingredients."))
+
+    # Each branch of the OR can use its own index, Postgres combines them with a bitmap OR
+    by_ingredient = RecipeModel.id.in_(select(IngredientModel.recipe_id).where(ingredient_document.op("@@")(terms)))
+    matches = or_(document.op("@@")(terms), by_ingredient, RecipeModel.title.op("%")(text))
+
+    # ts_rank and similarity are real (float4). The rank goes into the paging cursor as a Python
+    # float and comes back as a float8 parameter, which a float4 never equals, so work in float8
+    rank = cast(func.ts_rank(document, terms)
+                + func.similarity(RecipeModel.title, text)
+                + case((by_ingredient, 0.1), else_=0.0), Float(53))
+    return query.filter(matches), rank
+
+def _search_sqlite(query, text):
+    # Quote every word so FTS5 treats the input as plain terms (all of which must match),
+    # never as query syntax
+    terms = " ".join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+    if not terms:
+        return query.filter(false()), literal(0.0)
+
+    fts = table("recipe_search", column("rowid"))
+    fts_name = literal_column("recipe_search")
+    # bm25() scores better matches lower, flip it so higher ranks come first like ts_rank
+    matches = (
+        select(fts.c.rowid.label("recipe_id"), (-func.bm25(fts_name)).label("rank"))
+        .where(fts_name.op("MATCH")(terms))
+        .subquery()
+    )
+    return query.join(matches, matches.c.recipe_id == RecipeModel.id), matches.c.rank
@@ -0,0 +1,103 @@
+# models/slow_queries.py
+#
+# Slow query log: every statement that takes at least threshold_ms is written to
+# the "slow_queries" logger as one JSON line with its bound parameters, the route
+# that ran it and the database's plan for it, e.g. a Seq Scan on ingredients where
+# an index lookup on recipe_id was expected.
+
+import json
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from sqlalchemy import event
+from middleware.context import current_request
+
+logger = logging.getLogger("slow_queries")
+if not logger.handlers:
+    # One bare JSON document per line, ready for a log shipper
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Only these have a plan. SAVEPOINT, BEGIN, SET and the like would just fail to EXPLAIN
+# (after a savepoint round trip of their own on Postgres).
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+class SlowQueryLog:
+
+    def __init__(self, threshold_ms: float, sample_rate: float = 1.0, explain_analyze: bool = False):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.explain_analyze = explain_analyze
+
+    def attach(self, engine):
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def detach(self, engine):
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["slow_query_started"].pop()) * 1000
+        if duration_ms < self.threshold_ms or random.random() >= self.sample_rate:
+            return
+
+        request = current_request.get()
+        explainable = not executemany and statement.lstrip().upper().startswith(EXPLAINABLE)
+        record = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "statement": statement,
+            "parameters": parameters,
+            "executemany": executemany,
+            "method": request.method if request else None,
+            "route": request.route if request else None,
+            "plan": self.explain(conn, statement, parameters) if explainable else None,
+        }
+        logger.info(json.dumps(record, default=str))
+
+    def explain(self, conn, statement: str, parameters):
+        """ The plan for a statement, as the database reports it (an error message if it can't) """
+        dialect = conn.dialect.name
+        analyze = self.explain_analyze and statement.lstrip().upper().startswith("SELECT")
+        if dialect == "postgresql":
+            explain = f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}" if analyze else f"EXPLAIN (FORMAT JSON) {statement}"
+        elif dialect == "sqlite":
+            explain = f"EXPLAIN QUERY PLAN {statement}"
+        else:
+            return None
+
+        # A separate cursor straight on the DBAPI connection, so the EXPLAIN itself
+        # doesn't go through the engine events (and this log) again. On Postgres it runs in
+        # a savepoint, a failed EXPLAIN mustn't abort the request's transaction.
+        savepoint = dialect == "postgresql"
+        cursor = conn.connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            cursor.execute(explain, parameters)
+            rows = cursor.fetchall()
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception as error:
+            if savepoint:
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                except Exception:
+                    pass
+            return f"EXPLAIN failed: {error}"
+        finally:
+            cursor.close()
+        if dialect == "postgresql":
+            plan = rows[0][0]
+            return json.loads(plan) if isinstance(plan, str) else plan
+        return [row[-1] for row in rows]
@@ -1,11 +1,16 @@
 # models/step.py
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 class StepModel(BaseModel):
 
     __tablename__ = "steps"
+    # Serves both "all steps of a recipe" (recipe_id is the leading column, so no separate
+    # recipe_id index is needed) and reading them back already sorted by step_order
+    __table_args__ = (
+        Index("ix_steps_recipe_id_step_order", "recipe_id", "step_order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     step_order = Column(Integer, nullable=False)
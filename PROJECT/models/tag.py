@@ -0,0 +1,62 @@
+# models/tag.py
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import relationship
+from .base import Base, BaseModel
+
+# Many (RecipeModel) to many (TagModel). The primary key serves "tags of a recipe",
+# the (tag_id, recipe_id) index serves "recipes with a tag" and tag counts.
+recipe_tags = Table(
+    "recipe_tags",
+    Base.metadata,
+    Column("recipe_id", Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_recipe_tags_tag_id_recipe_id", "tag_id", "recipe_id"),
+)
+
+class TagModel(BaseModel):
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, unique=True, index=True)
+
+    recipes = relationship("RecipeModel", secondary=recipe_tags, back_populates="tags")
+
+
+def split_tags(cuisine_tags):
+    """ "Italian, veal, pasta" -> ["italian", "veal", "pasta"] """
+    names = []
+    for name in (cuisine_tags or "").split(","):
+        name = name.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def insert_tag_names(session, names):
+    """ Create the tags named, skipping any that exist (or another transaction creates meanwhile) """
+    connection = session.connection()
+    dialect = connection.dialect.name
+    rows = [{"name": name} for name in sorted(names)]
+    if dialect == "postgresql":
+        statement = postgresql.insert(TagModel).on_conflict_do_nothing(index_elements=["name"])
+    elif dialect == "sqlite":
+        statement = sqlite.insert(TagModel).on_conflict_do_nothing(index_elements=["name"])
+    else:
+        statement = insert(TagModel)
+    connection.execute(statement, rows)
+
+def sync_tags(session, recipes):
+    """ Point each recipe's tags at the TagModel rows named in its cuisine_tags, creating missing ones """
+    wanted = {recipe: split_tags(recipe.cuisine_tags) for recipe in recipes}
+    names = {name for recipe_names in wanted.values() for name in recipe_names}
+    with session.no_autoflush:
+        tags = {tag.name: tag for tag in session.query(TagModel).filter(TagModel.name.in_(names))} if names else {}
+        missing = names - tags.keys()
+        if missing:
+            # Two requests can bring in the same new tag at once, a plain INSERT would fail the
+            # second one on tags.name UNIQUE. ON CONFLICT DO NOTHING, then read the ids back.
+            insert_tag_names(session, missing)
+            tags.update((tag.name, tag) for tag in session.query(TagModel).filter(TagModel.name.in_(missing)))
+        for recipe, recipe_names in wanted.items():
+            recipe.tags = [tags[name] for name in recipe_names]
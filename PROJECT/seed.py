@@ -1,53 +1,54 @@
 # seed.py
-from sqlalchemy.orm import sessionmaker
+import argparse
+import sys
 from models.base import Base
 from models.recipe import RecipeModel
 from models.ingredient import IngredientModel
 from models.step import StepModel
 from models.user import UserModel
+from models import search  # adds the full-text search indexes to create_all
 from data.recipe_data import recipes_list, ingredients_list, steps_list
 from data.user_data import user_list
+from data.loader import BATCH_SIZE, instance_rows, load, load_tags, report
 from config.environment import db_URI
 from sqlalchemy import create_engine
 
+parser = argparse.ArgumentParser(description="Seed the recipes database")
+parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per INSERT (or COPY) batch")
+args = parser.parse_args()
+
 engine = create_engine(db_URI)
-SessionLocal = sessionmaker(bind=engine)
 
 # ! This seed file is a separate program that can be used to "seed" our database with some initial data.
 try:
-    print("Recreating database..")
-    # ! Dropping (or deleting) the tables and creating them again is for convenience. Once we start to play around with
-    # ! our data, changing our models, this seed program will allow us to rapidly throw out the old data and replace it.
-    Base.metadata.drop_all(bind=engine)
+    if args.reset:
+        print("Recreating database..")
+        # ! Dropping (or deleting) the tables and creating them again is for convenience. Once we start to play around with
+        # ! our data, changing our models, this seed program will allow us to rapidly throw out the old data and replace it.
+        Base.metadata.drop_all(bind=engine)
+    # ! Only creates the tables that don't exist yet
     Base.metadata.create_all(bind=engine)
 
     divider="*********************************************************************"
     print(divider)
     print("seeding our database..")
     print(divider)
-    # ! Seed recipes
-    db = SessionLocal()
-    db.add_all(user_list)
-    db.commit()
-    #db.close()
-
-    #db = SessionLocal()
-    db.add_all(recipes_list)
-    db.commit()
-    #db.close()
-
-    #db = SessionLocal()
-    db.add_all(ingredients_list)
-    db.commit()
-    #db.close()
-
-    #db = SessionLocal()
-    db.add_all(steps_list)
-    db.commit()
-    
-    db.close()
-
+    # ! Rows are written in batches (or COPY on Postgres), rows that are already there are updated
+    # ! by id, so running the seed again brings the database back to the seed data without a reset.
+    with engine.begin() as connection:
+        stats = [
+            load(connection, UserModel, instance_rows(user_list), key=["id"], batch_size=args.batch_size),
+            load(connection, RecipeModel, instance_rows(recipes_list), key=["id"], batch_size=args.batch_size),
+            load(connection, IngredientModel, instance_rows(ingredients_list), key=["id"], batch_size=args.batch_size),
+            load(connection, StepModel, instance_rows(steps_list), key=["id"], batch_size=args.batch_size),
+            # ! Core inserts skip the ORM's before_flush hook, the tag rows are rebuilt from cuisine_tags here
+            load_tags(connection, batch_size=args.batch_size),
+        ]
+    report(stats)
 
     print("bye 👋")
 except Exception as e:
-    print(e)
\ No newline at end of file
+    print(e)
+    # a non-zero exit status, so scripts and CI notice the load failed
+    sys.exit(1)
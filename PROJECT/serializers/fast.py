@@ -0,0 +1,94 @@
+# serializers/fast.py
+#
+# The fast path for list endpoints. Instead of loading ORM objects and validating
+# each one through its schema (orm_mode walks every nested user, ingredient and
+# step), select just the columns the schemas need and build the response dicts from
+# the row tuples. The endpoints send them with ORJSONResponse.
+#
+# The columns and keys come from the schemas' own field lists, so the output has
+# exactly the schemas' names, order and nesting. tests/test_fast.py checks the
+# output against the schemas.
+
+from collections import defaultdict
+from sqlalchemy import select
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from .recipe import RecipeSchema
+from .ingredient import IngredientSchema
+from .step import StepSchema
+from .user import UserSchema
+
+
+def schema_columns(schema, model, prefix: str = "", exclude=()):
+    """ The model's columns behind the schema's fields, in field order, labelled prefix + field name """
+    return tuple(getattr(model, name).label(prefix + name) for name in schema.model_fields if name not in exclude)
+
+def rows_to_dicts(rows):
+    return [row._asdict() for row in rows]
+
+
+ingredient_columns = schema_columns(IngredientSchema, IngredientModel)
+step_columns = schema_columns(StepSchema, StepModel)
+
+# RecipeSchema's nested fields are filled in from their own queries, the user's columns
+# come along in the recipe rows (prefixed, so they can't clash with the recipe's)
+RECIPE_NESTED = ("user", "ingredients", "steps")
+RECIPE_FIELDS = tuple(name for name in RecipeSchema.model_fields if name not in RECIPE_NESTED)
+
+def recipe_columns_for(fields=RECIPE_FIELDS, include=RECIPE_NESTED):
+    """ The columns for the recipe rows of a (possibly sparse) list, the recipe's id always among them """
+    excluded = [*RECIPE_NESTED, *(name for name in RECIPE_FIELDS if name not in fields)]
+    columns = schema_columns(RecipeSchema, RecipeModel, exclude=excluded)
+    if "user" in include:
+        columns += schema_columns(UserSchema, UserModel, prefix="user_")
+    return columns
+
+def recipe_children(recipe_ids, include=RECIPE_NESTED):
+    """ SELECTs for the requested child collections of a page of recipes, in the relationships' order """
+    statements = {
+        "ingredients": select(*ingredient_columns).where(IngredientModel.recipe_id.in_(recipe_ids)).order_by(IngredientModel.id),
+        "steps": select(*step_columns).where(StepModel.recipe_id.in_(recipe_ids)).order_by(StepModel.step_order, StepModel.id),
+    }
+    return {name: statement for name, statement in statements.items() if name in include}
+
+def build_recipes(recipe_rows, children, fields=RECIPE_FIELDS, include=RECIPE_NESTED):
+    """ RecipeSchema-shaped dicts (only the requested parts) from recipe_columns_for rows and their children's rows """
+    by_recipe = {name: defaultdict(list) for name in children}
+    for name, rows in children.items():
+        for row in rows:
+            by_recipe[name][row.recipe_id].append(row._asdict())
+
+    recipes = []
+    for row in recipe_rows:
+        recipe = {}
+        for name in RecipeSchema.model_fields:
+            if name == "user":
+                if "user" in include:
+                    user = {field: getattr(row, "user_" + field) for field in UserSchema.model_fields}
+                    # all NULL when the outer join found no user
+                    recipe[name] = user if any(value is not None for value in user.values()) else None
+            elif name in RECIPE_NESTED:
+                if name in include:
+                    recipe[name] = by_recipe[name][row.id]
+            elif name in fields:
+                recipe[name] = getattr(row, name)
+        recipes.append(recipe)
+    return recipes
+
+def project_recipe(recipe: RecipeModel, fields=RECIPE_FIELDS, include=RECIPE_NESTED):
+    """ The requested parts of a RecipeSchema-shaped dict, read off a RecipeModel loaded with just those parts """
+    nested = {"user": UserSchema, "ingredients": IngredientSchema, "steps": StepSchema}
+    project = {}
+    for name in RecipeSchema.model_fields:
+        if name == "user":
+            if "user" in include:
+                project[name] = recipe.user and {field: getattr(recipe.user, field) for field in UserSchema.model_fields}
+        elif name in RECIPE_NESTED:
+            if name in include:
+                project[name] = [{field: getattr(child, field) for field in nested[name].model_fields}
+                                 for child in getattr(recipe, name)]
+        elif name in fields:
+            project[name] = getattr(recipe, name)
+    return project
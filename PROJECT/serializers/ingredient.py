@@ -9,4 +9,9 @@ class IngredientSchema(BaseModel):
     recipe_id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class IngredientCreate(BaseModel):
+    # An ingredient sent inline with a new recipe, recipe_id comes from the recipe itself
+    name: str
+    quantity: str
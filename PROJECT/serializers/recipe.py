@@ -1,8 +1,8 @@
 # serializers/recipe.py
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from .step import StepSchema
-from .ingredient import IngredientSchema
+from .step import StepSchema, StepCreate
+from .ingredient import IngredientSchema, IngredientCreate
 from .user import UserSchema
 
 class RecipeSchema(BaseModel):
@@ -12,7 +12,7 @@ class RecipeSchema(BaseModel):
   cuisine_tags: str
   serves: int
   notes: str
-  user: UserSchema
+  user: Optional[UserSchema] = None # user_id is nullable
   
   ingredients: List[IngredientSchema] = []
   steps: List[StepSchema] = []
@@ -25,7 +25,8 @@ class RecipeCreate(BaseModel):
   recipe_type: str
   cuisine_tags: str
   serves: int
-  notes: str    
-  
-
+  notes: str
 
+  # Optional children, created in the same transaction as the recipe
+  ingredients: List[IngredientCreate] = []
+  steps: List[StepCreate] = []
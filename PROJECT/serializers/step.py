@@ -9,4 +9,14 @@ class StepSchema(BaseModel):
     recipe_id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class StepCreate(BaseModel):
+    # A step sent inline with a new recipe, recipe_id comes from the recipe itself
+    step_order: int
+    step_details: str
+
+class StepMove(BaseModel):
+    # The place the step should end up in (1 is first, past the end is last), the steps
+    # in between shift by one to make room. The recipe's steps are renumbered 1..n.
+    step_order: int = Field(..., ge=1)
@@ -0,0 +1,9 @@
+# serializers/tag.py
+from pydantic import BaseModel
+
+class TagCountSchema(BaseModel):
+  name: str
+  count: int
+
+  class Config:
+    orm_mode = True
@@ -0,0 +1,107 @@
+import pytest
+from starlette.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import app
+from models.database import get_db
+from models.base import Base
+from tests.lib import seed_db
+from cache.recipes import recipe_cache
+from dependencies.get_current_user import token_cache
+
+# An in-memory database: every pytest process (each xdist worker too) gets its own, and
+# nothing is left behind on disk. StaticPool keeps the one connection alive, the database
+# only exists as long as it's open.
+SQLALCHEMY_DATABASE_URL = "sqlite://"
+
+@pytest.fixture(scope="session")
+def engine():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    # pysqlite starts and ends transactions on its own, which breaks SAVEPOINT.
+    # Turn that off and let SQLAlchemy emit BEGIN itself.
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    # The schema and the seed data are built once for the whole run
+    Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as db:
+        seed_db(db)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def test_db(engine) -> Session:
+    # Each test runs inside a transaction that's rolled back afterwards. The app's commits
+    # only release a SAVEPOINT inside it, so every test starts from the seed data.
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+    # cached recipes and tokens may describe rows another test changed
+    recipe_cache.clear()
+    token_cache.clear()
+    yield db
+    db.close()
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture
+def override_get_db(test_db):
+    def _get_db_override():
+        return test_db
+    app.dependency_overrides[get_db] = _get_db_override
+    yield
+    app.dependency_overrides = {}
+
+@pytest.fixture
+def test_app(override_get_db):
+    client = TestClient(app)
+    yield client
+
+@pytest.fixture(scope="module")
+def test_async_app(tmp_path_factory):
+    # The async routers on their own app, backed by aiosqlite on a freshly seeded database
+    from fastapi import FastAPI
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from sqlalchemy.pool import NullPool
+    from models.async_database import get_async_db
+    from controllers.async_recipes import router as RecipesRouter
+    from controllers.async_ingredients import router as IngredientsRouter
+    from controllers.async_steps import router as StepsRouter
+    from controllers.async_users import router as UsersRouter
+
+    path = tmp_path_factory.mktemp("async") / "test.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    db = sessionmaker(bind=sync_engine)()
+    seed_db(db)
+    db.close()
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def _get_async_db_override():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    recipe_cache.clear()
+
+    async_app = FastAPI()
+    for router in (RecipesRouter, IngredientsRouter, StepsRouter, UsersRouter):
+        async_app.include_router(router, prefix="/api")
+    async_app.dependency_overrides[get_async_db] = _get_async_db_override
+
+    with TestClient(async_app) as client:
+        yield client
@@ -0,0 +1,67 @@
+# tests/lib.py
+
+from contextlib import contextmanager
+from fastapi.testclient import TestClient
+from sqlalchemy import event, inspect
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.user import UserModel
+from data.recipe_data import recipes_list, ingredients_list, steps_list
+from data.user_data import user_list
+
+
+def _rows(instances):
+    # The data/ lists hold ORM instances that get attached to whichever session
+    # adds them first, so keep a plain copy of their column values and build
+    # fresh rows every time a test module seeds its database.
+    return [
+        {column.key: getattr(instance, column.key) for column in inspect(instance).mapper.column_attrs
+         if column.key in instance.__dict__}
+        for instance in instances
+    ]
+
+user_rows = _rows(user_list)
+recipe_rows = _rows(recipes_list)
+ingredient_rows = _rows(ingredients_list)
+step_rows = _rows(steps_list)
+
+
+def seed_db(db):
+    db.commit()
+
+    db.add_all(UserModel(**row) for row in user_rows)
+    db.commit()
+
+    db.add_all(RecipeModel(**row) for row in recipe_rows)
+    db.commit()
+
+    db.add_all(IngredientModel(**row) for row in ingredient_rows)
+    db.commit()
+
+    db.add_all(StepModel(**row) for row in step_rows)
+    db.commit()
+
+
+def login(test_app: TestClient, username: str):
+    response = test_app.post("/api/login", json={"username": username})
+    token = response.json()['token']
+    headers = {"Authorization": f"Bearer {token}"}
+    return headers
+
+
+@contextmanager
+def count_queries(engine):
+    """ Collect every SQL statement the engine sends while the block runs """
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # the savepoints are the test_db fixture's, not the app's
+        if not statement.startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
@@ -0,0 +1,171 @@
+# tests/test_async.py
+
+import json
+from fastapi.testclient import TestClient
+from tests.lib import login
+
+
+def test_get_recipes(test_async_app: TestClient):
+    response = test_async_app.get("/api/recipes")
+    assert response.status_code == 200
+    recipes = response.json()
+    assert [recipe['title'] for recipe in recipes] == ["Veal Piccata", "Baked Mac and Cheese"]
+    assert recipes[0]['user']['username'] == "nick123"
+    assert len(recipes[0]['ingredients']) == 11
+    assert len(recipes[0]['steps']) == 10
+
+def test_get_recipes_paginated(test_async_app: TestClient):
+    response = test_async_app.get("/api/recipes?limit=1&with_total=true")
+    assert [recipe['id'] for recipe in response.json()] == [1]
+    assert response.headers['X-Total-Count'] == '2'
+
+    response = test_async_app.get("/api/recipes", params={"limit": 1, "cursor": response.headers['X-Next-Cursor']})
+    assert [recipe['id'] for recipe in response.json()] == [2]
+    assert 'X-Next-Cursor' not in response.headers
+
+def test_get_single_recipe_not_found(test_async_app: TestClient):
+    response = test_async_app.get("/api/recipes/9999")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Recipe not found"}
+
+def test_export_recipes(test_async_app: TestClient):
+    response = test_async_app.get("/api/recipes/export")
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == test_async_app.get("/api/recipes").json()
+
+def test_create_update_delete_recipe(test_async_app: TestClient):
+    headers = login(test_async_app, 'charles')
+    recipe_data = {
+        "title": "Omelette", "recipe_type": "breakfast", "cuisine_tags": "French", "serves": 1, "notes": "",
+        "ingredients": [{"name": "Eggs", "quantity": "3"}],
+        "steps": [{"step_order": 1, "step_details": "Whisk and fry"}],
+    }
+    response = test_async_app.post("/api/recipes", headers=headers, json=recipe_data)
+    assert response.status_code == 200
+    recipe = response.json()
+    assert recipe['user']['username'] == 'charles'
+    assert recipe['ingredients'][0]['name'] == "Eggs"
+    assert recipe == test_async_app.get(f"/api/recipes/{recipe['id']}").json()
+
+    update = dict(recipe, title="Cheese Omelette", serves=2)
+    response = test_async_app.put(f"/api/recipes/{recipe['id']}", headers=headers, json=update)
+    assert response.status_code == 200
+    assert response.json()['title'] == "Cheese Omelette"
+    assert response.json()['serves'] == 2
+    assert response.json()['steps'] == recipe['steps']
+
+    response = test_async_app.delete(f"/api/recipes/{recipe['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"message": f"Recipe {recipe['id']} deleted successfully"}
+    assert test_async_app.get(f"/api/recipes/{recipe['id']}").status_code == 404
+    # the cascade removed the children too
+    ingredient_id = recipe['ingredients'][0]['id']
+    assert test_async_app.get(f"/api/ingredients/{ingredient_id}").status_code == 404
+
+def test_update_recipe_restricted(test_async_app: TestClient):
+    headers = login(test_async_app, 'charles')
+    recipe = test_async_app.get("/api/recipes/1").json()
+
+    response = test_async_app.put("/api/recipes/1", headers=headers, json=recipe)
+    assert response.status_code == 403
+    assert response.json() == {'detail': 'Operation forbidden'}
+
+def test_ingredient_crud(test_async_app: TestClient):
+    headers = login(test_async_app, 'nick123')
+    ingredient = {"name": "Garlic", "quantity": "2 cloves", "recipe_id": 2}
+
+    response = test_async_app.post("/api/ingredients", headers=headers, json=ingredient)
+    assert response.status_code == 200
+    ingredient_id = response.json()['id']
+
+    response = test_async_app.put(f"/api/ingredients/{ingredient_id}", headers=headers,
+                                  json=dict(ingredient, quantity="4 cloves"))
+    assert response.status_code == 200
+    assert response.json()['quantity'] == "4 cloves"
+
+    response = test_async_app.delete(f"/api/ingredients/{ingredient_id}", headers=headers)
+    assert response.status_code == 200
+    assert test_async_app.get(f"/api/ingredients/{ingredient_id}").status_code == 404
+
+def test_create_steps_bulk(test_async_app: TestClient):
+    headers = login(test_async_app, 'nick123')
+    steps = [{"step_order": number, "step_details": f"Step {number}", "recipe_id": 2} for number in range(1, 4)]
+
+    response = test_async_app.post("/api/steps/bulk", headers=headers, json=steps)
+    assert response.status_code == 200
+    assert [step['step_details'] for step in response.json()] == ["Step 1", "Step 2", "Step 3"]
+    assert all(step['id'] for step in response.json())
+
+def test_create_steps_bulk_restricted(test_async_app: TestClient):
+    headers = login(test_async_app, 'charles')
+    steps = [{"step_order": 1, "step_details": "Nope", "recipe_id": 1}]
+
+    response = test_async_app.post("/api/steps/bulk", headers=headers, json=steps)
+    assert response.status_code == 403
+
+def test_move_step(test_async_app: TestClient):
+    headers = login(test_async_app, 'nick123')
+
+    response = test_async_app.put("/api/steps/8/move", headers=headers, json={"step_order": 2})
+    assert response.status_code == 200
+    assert [step['id'] for step in response.json()] == [1, 8, 2, 3, 4, 5, 6, 7, 9, 10]
+
+    # past the end means last place
+    response = test_async_app.put("/api/steps/8/move", headers=headers, json={"step_order": 99})
+    assert [step['id'] for step in response.json()] == [1, 2, 3, 4, 5, 6, 7, 9, 10, 8]
+    assert [step['step_order'] for step in response.json()] == list(range(1, 11))
+
+    response = test_async_app.put("/api/steps/8/move", headers=login(test_async_app, 'charles'), json={"step_order": 1})
+    assert response.status_code == 403
+
+def test_move_step_sparse_and_duplicate_orders(test_async_app: TestClient):
+    headers = login(test_async_app, 'nick123')
+    recipe = test_async_app.post("/api/recipes", headers=headers, json={
+        "title": "Move Me", "recipe_type": "entree", "cuisine_tags": "", "serves": 2, "notes": ""}).json()
+    steps = [{"step_order": order, "step_details": f"Step {order}", "recipe_id": recipe['id']} for order in (10, 20, 20, 30)]
+    ids = [step['id'] for step in test_async_app.post("/api/steps/bulk", headers=headers, json=steps).json()]
+
+    # last place, however sparse the orders
+    response = test_async_app.put(f"/api/steps/{ids[0]}/move", headers=headers, json={"step_order": 50})
+    assert [step['id'] for step in response.json()] == [ids[1], ids[2], ids[3], ids[0]]
+
+    # the tied steps keep their (step_order, id) order, and everything is renumbered 1..n
+    response = test_async_app.put(f"/api/steps/{ids[3]}/move", headers=headers, json={"step_order": 2})
+    steps = response.json()
+    assert [step['id'] for step in steps] == [ids[1], ids[3], ids[2], ids[0]]
+    assert [step['step_order'] for step in steps] == [1, 2, 3, 4]
+
+def test_search_recipes(test_async_app: TestClient):
+    response = test_async_app.get("/api/recipes/search?q=capers")
+    assert response.status_code == 200
+    assert [recipe['title'] for recipe in response.json()] == ["Veal Piccata"]
+    assert response.json()[0]['ingredients']
+
+    first = test_async_app.get("/api/recipes/search?q=pasta&limit=1&with_total=true")
+    assert first.headers['X-Total-Count'] == '2'
+    second = test_async_app.get("/api/recipes/search", params={"q": "pasta", "limit": 1, "cursor": first.headers['X-Next-Cursor']})
+    assert 'X-Next-Cursor' not in second.headers
+    titles = {recipe['title'] for recipe in first.json() + second.json()}
+    assert titles == {"Veal Piccata", "Baked Mac and Cheese"}
+
+def test_recipe_not_modified(test_async_app: TestClient):
+    etag = test_async_app.get("/api/recipes/1").headers['etag']
+    response = test_async_app.get("/api/recipes/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    etag = test_async_app.get("/api/steps").headers['etag']
+    response = test_async_app.get("/api/steps", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_register_and_login(test_async_app: TestClient):
+    response = test_async_app.post("/api/register", json={"username": "ada", "email": "ada@ada.com"})
+    assert response.status_code == 200
+    assert response.json() == {"username": "ada", "email": "ada@ada.com"}
+
+    response = test_async_app.post("/api/login", json={"username": "ada"})
+    assert response.status_code == 200
+    assert 'token' in response.json()
+
+    response = test_async_app.post("/api/login", json={"username": "nobody"})
+    assert response.status_code == 400
@@ -0,0 +1,72 @@
+# tests/test_auth.py
+
+import jwt
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.user import UserModel
+from config.environment import secret
+from dependencies.get_current_user import token_cache
+from tests.lib import login, count_queries
+
+
+def test_token_is_cached(test_app: TestClient, override_get_db, test_db: Session):
+    token_cache.clear()
+    headers = login(test_app, 'nick123')
+    test_db.commit()
+
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.delete("/api/recipes/9999", headers=headers)
+    assert response.status_code == 404
+    # user lookup + recipe lookup
+    assert len(statements) == 2
+    assert token_cache.stats()['misses'] == 1
+
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.delete("/api/recipes/9999", headers=headers)
+    assert response.status_code == 404
+    # the user now comes from the cache
+    assert len(statements) == 1
+    assert token_cache.stats()['hits'] == 1
+
+def test_cached_user_still_authorizes(test_app: TestClient, test_db: Session):
+    token_cache.clear()
+    headers = login(test_app, 'charles')
+
+    # charles doesn't own recipe 1, with or without a cached user
+    for _ in range(2):
+        response = test_app.delete("/api/recipes/1", headers=headers)
+        assert response.status_code == 403
+        assert response.json() == {'detail': 'Operation forbidden'}
+    assert token_cache.stats()['hits'] == 1
+
+def test_user_update_evicts_tokens(test_app: TestClient, test_db: Session):
+    token_cache.clear()
+    headers = login(test_app, 'joe')
+    test_app.delete("/api/recipes/9999", headers=headers)
+    assert len(token_cache) == 1
+
+    user = test_db.query(UserModel).filter(UserModel.username == 'joe').first()
+    user.email = "joe@joe.com"
+    test_db.commit()
+    assert len(token_cache) == 0
+
+def test_expired_token_is_rejected(test_app: TestClient, test_db: Session):
+    token_cache.clear()
+    payload = {"exp": datetime.utcnow() - timedelta(minutes=1), "iat": datetime.utcnow(), "sub": 1}
+    headers = {"Authorization": f"Bearer {jwt.encode(payload, secret, algorithm='HS256')}"}
+
+    response = test_app.delete("/api/recipes/9999", headers=headers)
+    assert response.status_code == 403
+    assert response.json() == {'detail': 'Token has expired'}
+    assert len(token_cache) == 0
+
+def test_entries_expire_with_the_token(test_app: TestClient, test_db: Session):
+    token_cache.clear()
+    payload = {"exp": datetime.utcnow() + timedelta(seconds=30), "iat": datetime.utcnow(), "sub": 1}
+    token = jwt.encode(payload, secret, algorithm='HS256')
+    headers = {"Authorization": f"Bearer {token}"}
+    test_app.delete("/api/recipes/9999", headers=headers)
+
+    expires_at, _ = token_cache._entries[token]
+    assert expires_at <= jwt.decode(token, secret, algorithms=["HS256"])["exp"]
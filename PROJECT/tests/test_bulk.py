@@ -0,0 +1,55 @@
+# tests/test_bulk.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from tests.lib import login, count_queries
+
+
+def test_create_ingredients_bulk(test_app: TestClient, override_get_db, test_db: Session):
+    headers = login(test_app, 'nick123')
+    ingredients = [{"name": f"Spice {number}", "quantity": "1 pinch", "recipe_id": 2} for number in range(20)]
+
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.post("/api/ingredients/bulk", headers=headers, json=ingredients)
+    assert response.status_code == 200
+
+    created = response.json()
+    assert [ingredient['name'] for ingredient in created] == [ingredient['name'] for ingredient in ingredients]
+    assert all(ingredient['id'] is not None for ingredient in created)
+    # user + recipes lookup and the inserts, but no refresh per row
+    assert len([statement for statement in statements if statement.startswith("SELECT")]) <= 2
+
+    assert test_db.query(IngredientModel).filter(IngredientModel.recipe_id == 2).count() == 20
+
+def test_create_steps_bulk(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    steps = [{"step_order": number, "step_details": f"Step {number}", "recipe_id": 2} for number in range(1, 16)]
+
+    response = test_app.post("/api/steps/bulk", headers=headers, json=steps)
+    assert response.status_code == 200
+    assert [step['step_order'] for step in response.json()] == list(range(1, 16))
+    assert test_db.query(StepModel).filter(StepModel.recipe_id == 2).count() == 15
+
+def test_create_bulk_restricted(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'charles')
+    ingredients = [{"name": "Saffron", "quantity": "1 thread", "recipe_id": 1}]
+
+    response = test_app.post("/api/ingredients/bulk", headers=headers, json=ingredients)
+    assert response.status_code == 403
+    assert response.json() == {'detail': 'Operation forbidden'}
+    assert test_db.query(IngredientModel).filter(IngredientModel.name == "Saffron").count() == 0
+
+def test_create_bulk_recipe_not_found(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    steps = [
+        {"step_order": 1, "step_details": "Exists", "recipe_id": 1},
+        {"step_order": 1, "step_details": "Doesn't", "recipe_id": 9999},
+    ]
+
+    response = test_app.post("/api/steps/bulk", headers=headers, json=steps)
+    assert response.status_code == 404
+    assert response.json() == {'detail': 'Recipe not found'}
+    assert test_db.query(StepModel).filter(StepModel.step_details == "Exists").count() == 0
@@ -0,0 +1,58 @@
+# tests/test_compression.py
+
+import gzip
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from middleware.compression import accepts_gzip
+
+
+def raw_get(test_app: TestClient, url: str, accept_encoding: str):
+    # The body exactly as it went over the wire, before httpx decodes it
+    with test_app.stream("GET", url, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.8, *;q=0.1")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("*;q=0")
+    assert not accepts_gzip("gzip;q=nonsense")
+
+def test_large_response_compressed(test_app: TestClient, override_get_db, test_db: Session):
+    response, body = raw_get(test_app, "/api/recipes", "gzip")
+    assert response.headers['content-encoding'] == "gzip"
+    assert "accept-encoding" in response.headers['vary'].lower()
+    assert int(response.headers['content-length']) == len(body)
+
+    plain = test_app.get("/api/recipes", headers={"Accept-Encoding": "identity"})
+    assert 'content-encoding' not in plain.headers
+    assert json.loads(gzip.decompress(body)) == plain.json()
+    assert len(body) < len(plain.content)
+
+def test_refused_or_small_not_compressed(test_app: TestClient, test_db: Session):
+    response, body = raw_get(test_app, "/api/recipes", "gzip;q=0, identity")
+    assert 'content-encoding' not in response.headers
+
+    response, body = raw_get(test_app, "/api/recipes/1?fields=title&include=", "gzip")
+    assert 'content-encoding' not in response.headers
+    assert json.loads(body) == {"id": 1, "title": "Veal Piccata"}
+
+def test_streaming_compressed(test_app: TestClient, test_db: Session):
+    response, body = raw_get(test_app, "/api/recipes/export", "gzip")
+    assert response.headers['content-encoding'] == "gzip"
+    lines = gzip.decompress(body).decode().splitlines()
+    assert [json.loads(line)['title'] for line in lines] == ["Veal Piccata", "Baked Mac and Cheese"]
+
+def test_not_modified_untouched(test_app: TestClient, test_db: Session):
+    etag = test_app.get("/api/recipes").headers['etag']
+    response, body = raw_get(test_app, "/api/recipes", "gzip")
+    assert response.headers['etag'] == etag
+
+    response = test_app.get("/api/recipes", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    assert response.status_code == 304
+    assert 'content-encoding' not in response.headers
@@ -0,0 +1,78 @@
+# tests/test_conditional.py
+
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.ingredient import IngredientModel
+from models.recipe import RecipeModel
+from cache.recipes import recipe_cache
+from tests.lib import count_queries
+
+
+def test_recipe_validators(test_app: TestClient, override_get_db, test_db: Session):
+    response = test_app.get("/api/recipes/1")
+    assert response.status_code == 200
+    assert response.headers['etag'].startswith('W/"')
+    assert response.headers['last-modified'].endswith(" GMT")
+
+def test_recipe_not_modified(test_app: TestClient, test_db: Session):
+    etag = test_app.get("/api/recipes/1").headers['etag']
+
+    recipe_cache.clear()
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.get("/api/recipes/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers['etag'] == etag
+    # only the validators were read, the recipe itself was never loaded
+    assert len(statements) == 1
+
+def test_recipe_if_modified_since(test_app: TestClient, test_db: Session):
+    last_modified = test_app.get("/api/recipes/1").headers['last-modified']
+
+    response = test_app.get("/api/recipes/1", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    response = test_app.get("/api/recipes/1", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"})
+    assert response.status_code == 200
+
+    response = test_app.get("/api/recipes/1", headers={"If-Modified-Since": "not a date"})
+    assert response.status_code == 200
+
+def test_recipe_changes_invalidate(test_app: TestClient, test_db: Session):
+    etag = test_app.get("/api/recipes/1").headers['etag']
+
+    # a new ingredient changes the recipe's representation
+    test_db.add(IngredientModel(name="Capers", quantity="1 tbsp", recipe_id=1))
+    test_db.commit()
+    response = test_app.get("/api/recipes/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers['etag']
+
+    # and so does an edit to the recipe's own row
+    recipe = test_db.get(RecipeModel, 1)
+    recipe.updated_at = datetime.utcnow() + timedelta(minutes=1)
+    test_db.commit()
+    response = test_app.get("/api/recipes/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+
+def test_recipe_not_found(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes/9999", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+def test_list_validators(test_app: TestClient, test_db: Session):
+    for url in ("/api/recipes", "/api/ingredients", "/api/steps", "/api/ingredients/1"):
+        etag = test_app.get(url).headers['etag']
+        response = test_app.get(url, headers={"If-None-Match": f'"other", {etag}'})
+        assert response.status_code == 304
+
+    # every page has its own tag
+    assert test_app.get("/api/recipes?limit=1").headers['etag'] != test_app.get("/api/recipes").headers['etag']
+
+    etag = test_app.get("/api/ingredients").headers['etag']
+    test_db.delete(test_db.get(IngredientModel, 1))
+    test_db.commit()
+    response = test_app.get("/api/ingredients", headers={"If-None-Match": etag})
+    assert response.status_code == 200
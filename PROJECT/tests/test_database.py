@@ -0,0 +1,36 @@
+# tests/test_database.py
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from models.database import TimedQueuePool, engine, engine_options
+from config.environment import db_URI, db_pool_size, db_max_overflow, db_pool_pre_ping, db_statement_timeout_ms
+
+
+def test_api_engine_uses_configured_pool():
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == db_pool_size
+    assert engine.pool._max_overflow == db_max_overflow
+    assert engine.pool._pre_ping == db_pool_pre_ping
+
+@pytest.mark.skipif(not db_URI.startswith("postgresql") or not db_statement_timeout_ms,
+                    reason="statement_timeout is only sent to Postgres")
+def test_statement_timeout_is_sent_to_postgres():
+    options = engine_options()
+    assert options["connect_args"]["options"].startswith("-c statement_timeout=")
+
+def test_pool_records_checkout_waits(tmp_path):
+    test_engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=TimedQueuePool,
+                                pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    with test_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        # The only connection is checked out, so the next checkout waits and gives up
+        with pytest.raises(exc.TimeoutError):
+            test_engine.connect()
+
+    stats = test_engine.pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["wait_seconds_max"] >= 0.05
+    test_engine.dispose()
@@ -0,0 +1,56 @@
+# tests/test_fast.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from serializers.recipe import RecipeSchema
+from serializers.ingredient import IngredientSchema
+from serializers.step import StepSchema
+
+
+def through_schema(schema, instances):
+    # What the endpoints returned before the fast path: every object validated by its schema
+    return [schema.model_validate(instance, from_attributes=True).model_dump(mode="json") for instance in instances]
+
+
+def test_recipes_parity(test_app: TestClient, override_get_db, test_db: Session):
+    response = test_app.get("/api/recipes")
+    assert response.status_code == 200
+
+    expected = through_schema(RecipeSchema, test_db.query(RecipeModel).order_by(RecipeModel.id))
+    assert response.json() == expected
+    # same keys in the same order, nested ones included
+    recipe = response.json()[0]
+    assert list(recipe) == list(RecipeSchema.model_fields)
+    assert list(recipe['user']) == ["username", "email"]
+    assert list(recipe['ingredients'][0]) == list(IngredientSchema.model_fields)
+    assert list(recipe['steps'][0]) == list(StepSchema.model_fields)
+
+def test_ingredients_and_steps_parity(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/ingredients?limit=200")
+    assert response.json() == through_schema(IngredientSchema, test_db.query(IngredientModel).order_by(IngredientModel.id))
+
+    response = test_app.get("/api/steps?limit=200")
+    assert response.json() == through_schema(StepSchema, test_db.query(StepModel).order_by(StepModel.id))
+
+def test_headers_kept(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes?limit=1&with_total=true")
+    assert response.headers['content-type'] == "application/json"
+    assert response.headers['x-total-count'] == "2"
+    assert 'x-next-cursor' in response.headers
+    assert 'etag' in response.headers
+
+    response = test_app.get(f"/api/recipes?limit=1&cursor={response.headers['x-next-cursor']}")
+    assert [recipe['id'] for recipe in response.json()] == [2]
+
+def test_empty_page(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes?tag=nothing-tagged-this")
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_async_parity(test_async_app: TestClient, test_app: TestClient):
+    # both stacks serve the same seed data the same way
+    assert test_async_app.get("/api/recipes").json() == test_app.get("/api/recipes").json()
+    assert test_async_app.get("/api/steps?limit=5").json() == test_app.get("/api/steps?limit=5").json()
@@ -0,0 +1,93 @@
+# tests/test_fieldsets.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.recipe import RecipeModel
+from cache.recipes import recipe_cache
+from tests.lib import count_queries
+
+
+def test_recipes_fields(test_app: TestClient, override_get_db, test_db: Session):
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.get("/api/recipes?fields=title&include=")
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "title": "Veal Piccata"}, {"id": 2, "title": "Baked Mac and Cheese"}]
+
+    # the validators and one narrow SELECT of recipes, no user JOIN and no children
+    assert len(statements) == 2
+    assert "recipes.notes" not in statements[1]
+    assert "users" not in statements[1]
+
+def test_recipes_include(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes?fields=serves,title&include=user")
+    recipe = response.json()[0]
+    # always in the schema's order, whatever order they were asked for in
+    assert list(recipe) == ["id", "title", "serves", "user"]
+    assert recipe['user'] == {"username": "nick123", "email": "nick@nick.com"}
+
+    response = test_app.get("/api/recipes?include=steps")
+    recipe = response.json()[0]
+    assert list(recipe) == ["id", "title", "recipe_type", "cuisine_tags", "serves", "notes", "steps"]
+    assert [step['step_order'] for step in recipe['steps']] == list(range(1, 11))
+
+def test_recipe_without_user(test_app: TestClient, test_db: Session):
+    test_db.add(RecipeModel(title="Orphan Stew", recipe_type="entree", cuisine_tags="", serves=2, notes=""))
+    test_db.commit()
+
+    # the same recipes whichever fields are asked for, user null when there is none
+    for url in ("/api/recipes", "/api/recipes?fields=title&include=user", "/api/recipes?fields=title&include="):
+        titles = [recipe['title'] for recipe in test_app.get(url).json()]
+        assert titles == ["Veal Piccata", "Baked Mac and Cheese", "Orphan Stew"]
+    assert test_app.get("/api/recipes?fields=title&include=user").json()[-1]['user'] is None
+
+    orphan_id = test_db.query(RecipeModel.id).filter(RecipeModel.title == "Orphan Stew").scalar()
+    assert test_app.get(f"/api/recipes/{orphan_id}").json()['user'] is None
+    assert test_app.get(f"/api/recipes/{orphan_id}?fields=title&include=user").json() == {"id": orphan_id, "title": "Orphan Stew", "user": None}
+
+def test_unknown_names(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes?fields=title,password")
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Unknown field: password"
+
+    response = test_app.get("/api/recipes/1?include=comments")
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Unknown include: comments"
+
+def test_single_recipe_fields(test_app: TestClient, test_db: Session):
+    recipe_cache.clear()
+
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.get("/api/recipes/1?fields=title&include=ingredients")
+    assert response.status_code == 200
+    recipe = response.json()
+    assert list(recipe) == ["id", "title", "ingredients"]
+    assert len(recipe['ingredients']) == 11
+
+    # load_only narrowed the recipe SELECT, and the user and steps were never loaded
+    recipe_select = [statement for statement in statements if statement.startswith("SELECT recipes.")]
+    assert len(recipe_select) == 1
+    assert "recipes.notes" not in recipe_select[0]
+    loads = statements[1:]  # after the validators
+    assert not any("FROM steps" in statement or "users.email" in statement for statement in loads)
+
+    # sparse reads are neither served from nor written to the cache
+    assert 'x-cache' not in response.headers
+    assert recipe_cache.get(1) is None
+
+def test_single_recipe_fields_not_modified(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes/1?fields=title&include=")
+    assert response.json() == {"id": 1, "title": "Veal Piccata"}
+    # a different representation from the full recipe, so its own validator
+    assert response.headers['etag'] != test_app.get("/api/recipes/1").headers['etag']
+
+    response = test_app.get("/api/recipes/1?fields=title&include=", headers={"If-None-Match": response.headers['etag']})
+    assert response.status_code == 304
+
+def test_async_fields(test_async_app: TestClient):
+    response = test_async_app.get("/api/recipes?fields=title&include=")
+    assert response.json() == [{"id": 1, "title": "Veal Piccata"}, {"id": 2, "title": "Baked Mac and Cheese"}]
+
+    response = test_async_app.get("/api/recipes/2?fields=serves&include=user")
+    assert response.json() == {"id": 2, "serves": 8, "user": {"username": "nick123", "email": "nick@nick.com"}}
@@ -0,0 +1,42 @@
+# tests/test_load_test.py
+
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.recipe import RecipeModel
+from benchmarks.load_test import parse_mix, percentile, run
+
+
+def test_parse_mix():
+    assert parse_mix("list=3,detail=1") == {"list": 3.0, "detail": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("list=1,explode=2")
+    with pytest.raises(ValueError):
+        parse_mix("list=0")
+
+def test_percentile():
+    ordered = [number / 100 for number in range(1, 101)]
+    assert percentile(ordered, 0.50) == 0.50
+    assert percentile(ordered, 0.99) == 0.99
+    assert percentile([0.2], 0.95) == 0.2
+    assert percentile([], 0.5) == 0.0
+
+def test_run(test_app: TestClient, override_get_db, test_db: Session):
+    async def scenario():
+        async with httpx.AsyncClient(app=test_app.app, base_url="http://test") as http:
+            # one client, the test session isn't shared across threads
+            return await run(http, ["nick123"], clients=1, requests=60,
+                             mix=parse_mix("list=1,detail=1,create=1,update=1,delete=1"), seed=4)
+
+    report = asyncio.run(scenario())
+    assert report['total']['requests'] == 60
+    assert report['total']['errors'] == 0
+    assert report['total']['p50_ms'] <= report['total']['p95_ms'] <= report['total']['p99_ms']
+    assert {"GET /api/recipes", "GET /api/recipes/{id}", "POST /api/recipes"} <= set(report['endpoints'])
+    assert sum(endpoint['requests'] for endpoint in report['endpoints'].values()) == 60
+
+    # whatever the run created is deleted again
+    assert test_db.query(func.count(RecipeModel.id)).scalar() == 2
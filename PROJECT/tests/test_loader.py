@@ -0,0 +1,118 @@
+# tests/test_loader.py
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import postgresql
+from models.base import Base
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.tag import TagModel, recipe_tags
+from models.user import UserModel
+from models import search
+from data.recipe_data import recipes_list, ingredients_list, steps_list
+from data.user_data import user_list
+from data.loader import _reset_sequence, instance_rows, load, load_tags
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/load.db")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+def seed(connection, batch_size=4):
+    return [
+        load(connection, UserModel, instance_rows(user_list), key=["id"], batch_size=batch_size),
+        load(connection, RecipeModel, instance_rows(recipes_list), key=["id"], batch_size=batch_size),
+        load(connection, IngredientModel, instance_rows(ingredients_list), key=["id"], batch_size=batch_size),
+        load(connection, StepModel, instance_rows(steps_list), key=["id"], batch_size=batch_size),
+        load_tags(connection, batch_size=batch_size),
+    ]
+
+def count(connection, table):
+    return connection.execute(select(func.count()).select_from(table)).scalar()
+
+
+def test_instance_rows():
+    rows = list(instance_rows(user_list))
+    assert rows[0] == {"id": 1, "username": "nick123", "email": "nick@nick.com"}
+    assert [row['id'] for row in rows] == [1, 2, 3, 4, 5]
+
+    # never numbered by position, a reordered list would overwrite other rows
+    with pytest.raises(ValueError):
+        list(instance_rows([UserModel(username="nobody", email="nobody@example.com")]))
+
+def test_load_and_reload(engine):
+    with engine.begin() as connection:
+        stats = seed(connection)
+    assert [(table_stats.table, table_stats.rows) for table_stats in stats] == \
+        [("users", 5), ("recipes", 2), ("ingredients", 11), ("steps", 10), ("recipe_tags", 4)]
+
+    with engine.begin() as connection:
+        assert connection.execute(select(RecipeModel.created_at)).scalar() is not None
+        assert connection.execute(
+            select(func.count()).select_from(IngredientModel).where(IngredientModel.recipe_id == 1)
+        ).scalar() == 11
+        # full-text search triggers still fire for Core inserts
+        assert connection.exec_driver_sql("SELECT count(*) FROM recipe_search WHERE recipe_search MATCH 'capers'").scalar() == 1
+
+    # a second run updates the same rows instead of adding to them
+    with engine.begin() as connection:
+        seed(connection)
+        assert count(connection, RecipeModel.__table__) == 2
+        assert count(connection, StepModel.__table__) == 10
+        assert count(connection, recipe_tags) == 4
+
+def test_upsert_updates_rows_and_tags(engine):
+    with engine.begin() as connection:
+        seed(connection)
+        load(connection, RecipeModel, [{"id": 2, "title": "Stovetop Mac and Cheese", "cuisine_tags": "pasta, quick"}],
+             key=["id"])
+        load_tags(connection)
+
+        recipe = connection.execute(select(RecipeModel.title, RecipeModel.serves).where(RecipeModel.id == 2)).one()
+        assert recipe == ("Stovetop Mac and Cheese", 8)
+        tags = connection.execute(
+            select(TagModel.name).join(recipe_tags).where(recipe_tags.c.recipe_id == 2).order_by(TagModel.name)
+        ).scalars().all()
+        assert tags == ["pasta", "quick"]
+
+def test_plain_insert(engine):
+    with engine.begin() as connection:
+        stats = load(connection, UserModel, ({"username": f"user{number}", "email": f"user{number}@x.com"}
+                                             for number in range(2500)), batch_size=1000)
+        assert stats.rows == 2500
+        assert count(connection, UserModel.__table__) == 2500
+
+def test_commit_every(engine):
+    # A failure part way keeps the batches committed before it, and loading again upserts over them
+    def users(fail_at=None):
+        for number in range(10):
+            if number == fail_at:
+                raise RuntimeError("load interrupted")
+            yield {"id": number + 1, "username": f"user{number}", "email": f"user{number}@x.com"}
+
+    with engine.connect() as connection:
+        with pytest.raises(RuntimeError):
+            load(connection, UserModel, users(fail_at=7), key=["id"], batch_size=2, commit_every=2)
+    with engine.connect() as connection:
+        assert count(connection, UserModel.__table__) == 4
+        load(connection, UserModel, users(), key=["id"], batch_size=2, commit_every=2)
+        connection.commit()
+        assert count(connection, UserModel.__table__) == 10
+
+def test_reset_sequence_on_empty_table():
+    # Postgres only, so just look at the statement: on an empty table setval(seq, 1, false)
+    # makes the next id 1, setval(seq, 1) alone would make it 2
+    class Recorder:
+        statements = []
+        def execute(self, statement):
+            self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+    _reset_sequence(Recorder(), RecipeModel.__table__, {"id", "title"})
+    assert Recorder.statements == [
+        "SELECT setval(pg_get_serial_sequence(%(pg_get_serial_sequence_1)s, %(pg_get_serial_sequence_2)s), "
+        "coalesce(max(recipes.id), %(coalesce_1)s), max(recipes.id) IS NOT NULL) AS setval_1 \nFROM recipes"
+    ]
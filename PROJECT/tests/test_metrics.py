@@ -0,0 +1,62 @@
+# tests/test_metrics.py
+
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from models.database import TimedQueuePool
+
+
+def scrape(test_app: TestClient):
+    response = test_app.get("/metrics")
+    assert response.status_code == 200
+    return {(sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in text_string_to_metric_families(response.text) for sample in family.samples}
+
+def sample(metrics, name, **labels):
+    return metrics.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+def test_request_metrics(test_app: TestClient, override_get_db, test_db: Session):
+    before = scrape(test_app)
+    response = test_app.get("/api/recipes")
+    assert response.status_code == 200
+    after = scrape(test_app)
+
+    # labelled with the route template, not the raw path
+    labels = {"method": "GET", "route": "/api/recipes"}
+    assert sample(after, "http_request_duration_seconds_count", status="200", **labels) \
+        == sample(before, "http_request_duration_seconds_count", status="200", **labels) + 1
+    # the validators, the recipes and their ingredients and steps, plus the SAVEPOINT test_db opens
+    assert sample(after, "http_request_db_statements_sum", **labels) \
+        == sample(before, "http_request_db_statements_sum", **labels) + 5
+    assert sample(after, "http_request_db_seconds_sum", **labels) > sample(before, "http_request_db_seconds_sum", **labels)
+
+def test_route_labels(test_app: TestClient, test_db: Session):
+    test_app.get("/api/recipes/1")
+    test_app.get("/api/recipes/9999")
+    test_app.get("/no/such/page")
+    metrics = scrape(test_app)
+
+    assert sample(metrics, "http_request_duration_seconds_count", method="GET", route="/api/recipes/{recipe_id}", status="200")
+    assert sample(metrics, "http_request_duration_seconds_count", method="GET", route="/api/recipes/{recipe_id}", status="404")
+    assert sample(metrics, "http_request_duration_seconds_count", method="GET", route="unmatched", status="404")
+    assert not any("9999" in str(labels) for _, labels in metrics)
+
+def test_cache_and_pool_metrics(test_app: TestClient, test_db: Session):
+    test_app.get("/api/recipes/1")
+    test_app.get("/api/recipes/1")
+    metrics = scrape(test_app)
+
+    assert sample(metrics, "cache_hits_total", cache="recipes") >= 1
+    assert 0 < sample(metrics, "cache_hit_ratio", cache="recipes") <= 1
+    assert ("db_pool_size", ()) in metrics
+    assert ("db_pool_checkouts_total", ()) in metrics
+
+def test_pool_wait_observed(test_app: TestClient, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=TimedQueuePool, pool_size=1)
+    before = sample(scrape(test_app), "db_pool_checkout_wait_seconds_count")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert sample(scrape(test_app), "db_pool_checkout_wait_seconds_count") == before + 1
+    engine.dispose()
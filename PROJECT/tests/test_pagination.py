@@ -0,0 +1,50 @@
+# tests/test_pagination.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from config.environment import max_page_size
+
+
+def test_first_page(test_app: TestClient, override_get_db):
+    response = test_app.get("/api/ingredients?limit=4")
+    assert response.status_code == 200
+    ingredients = response.json()
+    assert [ingredient['id'] for ingredient in ingredients] == [1, 2, 3, 4]
+    assert 'X-Next-Cursor' in response.headers
+    assert 'X-Total-Count' not in response.headers
+
+def test_follow_cursor_to_last_page(test_app: TestClient, test_db: Session):
+    seen = []
+    response = test_app.get("/api/ingredients?limit=4")
+    seen += [ingredient['id'] for ingredient in response.json()]
+    while 'X-Next-Cursor' in response.headers:
+        response = test_app.get("/api/ingredients", params={"limit": 4, "cursor": response.headers['X-Next-Cursor']})
+        assert response.status_code == 200
+        seen += [ingredient['id'] for ingredient in response.json()]
+
+    # Every row exactly once, in id order
+    assert seen == list(range(1, 12))
+
+def test_total_count(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/steps?limit=3&with_total=true")
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert response.headers['X-Total-Count'] == '10'
+
+def test_recipes_are_paginated(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes?limit=1")
+    assert response.status_code == 200
+    assert [recipe['title'] for recipe in response.json()] == ["Veal Piccata"]
+
+    response = test_app.get("/api/recipes", params={"limit": 1, "cursor": response.headers['X-Next-Cursor']})
+    assert [recipe['title'] for recipe in response.json()] == ["Baked Mac and Cheese"]
+    assert 'X-Next-Cursor' not in response.headers
+
+def test_invalid_cursor(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+def test_limit_is_capped(test_app: TestClient, test_db: Session):
+    response = test_app.get(f"/api/recipes?limit={max_page_size + 1}")
+    assert response.status_code == 422
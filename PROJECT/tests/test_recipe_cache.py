@@ -0,0 +1,91 @@
+# tests/test_recipe_cache.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.user import UserModel
+from cache.recipes import recipe_cache
+from tests.lib import login, count_queries
+
+
+def test_recipe_is_cached(test_app: TestClient, override_get_db, test_db: Session):
+    recipe_cache.clear()
+
+    response = test_app.get("/api/recipes/1")
+    assert response.status_code == 200
+    assert response.headers['x-cache'] == "MISS"
+    recipe = response.json()
+
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.get("/api/recipes/1")
+    assert response.headers['x-cache'] == "HIT"
+    assert statements == []
+    # the cached payload is exactly what was served the first time, validators included
+    assert response.json() == recipe
+    assert response.headers['etag'] == test_app.get("/api/recipes/1").headers['etag']
+
+    assert recipe_cache.stats()['hits'] == 2
+    assert recipe_cache.stats()['misses'] == 1
+    assert recipe_cache.stats()['hit_rate'] == 2 / 3
+
+def test_cached_not_modified(test_app: TestClient, test_db: Session):
+    etag = test_app.get("/api/recipes/1").headers['etag']
+    response = test_app.get("/api/recipes/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_recipe_update_invalidates(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    test_app.get("/api/recipes/1")
+
+    recipe = test_app.get("/api/recipes/1").json()
+    response = test_app.put("/api/recipes/1", headers=headers, json={**recipe, "title": "Chicken Piccata"})
+    assert response.status_code == 200
+    assert recipe_cache.get(1) is None
+
+    response = test_app.get("/api/recipes/1")
+    assert response.headers['x-cache'] == "MISS"
+    assert response.json()['title'] == "Chicken Piccata"
+
+def test_ingredient_writes_invalidate(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+
+    test_app.get("/api/recipes/1")
+    response = test_app.post("/api/ingredients", headers=headers,
+                             json={"name": "Pickled shallots", "quantity": "1 tbsp", "recipe_id": 1})
+    assert response.status_code == 200
+    ingredient_id = response.json()['id']
+    assert "Pickled shallots" in [ingredient['name'] for ingredient in test_app.get("/api/recipes/1").json()['ingredients']]
+
+    response = test_app.delete(f"/api/ingredients/{ingredient_id}", headers=headers)
+    assert response.status_code == 200
+    assert "Pickled shallots" not in [ingredient['name'] for ingredient in test_app.get("/api/recipes/1").json()['ingredients']]
+
+def test_step_writes_invalidate(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+
+    steps = [{"step_order": 11, "step_details": "Serve", "recipe_id": 1}]
+    test_app.get("/api/recipes/1")
+    test_app.post("/api/steps/bulk", headers=headers, json=steps)
+    assert test_app.get("/api/recipes/1").json()['steps'][-1]['step_details'] == "Serve"
+
+    # the reorder is a Core UPDATE, it evicts by hand
+    step_id = test_app.get("/api/recipes/1").json()['steps'][-1]['id']
+    test_app.put(f"/api/steps/{step_id}/move", headers=headers, json={"step_order": 1})
+    assert test_app.get("/api/recipes/1").json()['steps'][0]['step_details'] == "Serve"
+
+def test_user_update_invalidates(test_app: TestClient, test_db: Session):
+    test_app.get("/api/recipes/1")
+
+    # recipes embed their user
+    user = test_db.get(UserModel, 1)
+    user.email = "nick@example.com"
+    test_db.commit()
+    assert test_app.get("/api/recipes/1").json()['user']['email'] == "nick@example.com"
+
+def test_recipe_delete_invalidates(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+
+    assert test_app.get("/api/recipes/2").status_code == 200
+    response = test_app.delete("/api/recipes/2", headers=headers)
+    assert response.status_code == 200
+    assert test_app.get("/api/recipes/2").status_code == 404
@@ -0,0 +1,184 @@
+# tests/test_recipes.py
+
+import json
+from fastapi import Response
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.search import search_recipes
+from dependencies.pagination import Page, decode_cursor, encode_cursor
+from cache.recipes import recipe_cache
+from tests.lib import count_queries, login
+
+
+def test_get_recipes(test_app: TestClient, override_get_db):
+    response = test_app.get("/api/recipes")
+    assert response.status_code == 200
+    recipes = response.json()
+    assert isinstance(recipes, list)
+    assert len(recipes) == 2
+    for recipe in recipes:
+        assert 'id' in recipe
+        assert 'title' in recipe
+        assert 'user' in recipe
+        assert 'username' in recipe['user']
+        assert 'ingredients' in recipe
+        assert 'steps' in recipe
+
+def test_get_single_recipe(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes/1")
+    assert response.status_code == 200
+    recipe = response.json()
+
+    assert recipe['id'] == 1
+    assert recipe['title'] == "Veal Piccata"
+    assert recipe['user']['username'] == "nick123"
+    assert len(recipe['ingredients']) == 11
+    assert len(recipe['steps']) == 10
+
+def test_get_single_recipe_not_found(test_app: TestClient):
+    response = test_app.get("/api/recipes/9999")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Recipe not found"}
+
+def test_export_recipes(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes/export")
+    assert response.status_code == 200
+    assert response.headers['content-type'] == "application/x-ndjson"
+
+    lines = response.text.splitlines()
+    assert len(lines) == 2
+    exported = [json.loads(line) for line in lines]
+    assert [recipe['title'] for recipe in exported] == ["Veal Piccata", "Baked Mac and Cheese"]
+
+    # Each line is exactly what the detail endpoint returns for that recipe
+    assert exported[0] == test_app.get("/api/recipes/1").json()
+
+def test_get_recipes_query_count(test_app: TestClient, test_db: Session):
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.get("/api/recipes")
+    assert response.status_code == 200
+    # the ETag validators, recipes + users JOIN, then one SELECT ... IN each for ingredients and steps
+    assert len(statements) == 4
+
+    # More recipes must not mean more queries
+    for number in range(5):
+        recipe = RecipeModel(title=f"Query count {number}", recipe_type="side", cuisine_tags="test",
+                             serves=1, notes="", user_id=2)
+        recipe.ingredients = [IngredientModel(name="Water", quantity="1 cup")]
+        recipe.steps = [StepModel(step_order=1, step_details="Boil")]
+        test_db.add(recipe)
+    test_db.commit()
+
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.get("/api/recipes")
+    assert response.status_code == 200
+    assert len(response.json()) == 7
+    assert len(statements) == 4
+
+def test_get_single_recipe_query_count(test_app: TestClient, test_db: Session):
+    recipe_cache.clear()
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.get("/api/recipes/1")
+    assert response.status_code == 200
+    assert len(statements) == 4
+
+def test_create_recipe(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'charles')
+    recipe_data = {"title": "Toast", "recipe_type": "breakfast", "cuisine_tags": "bread", "serves": 1, "notes": ""}
+
+    response = test_app.post("/api/recipes", headers=headers, json=recipe_data)
+    assert response.status_code == 200
+    recipe = response.json()
+    assert recipe['title'] == "Toast"
+    assert recipe['user']['username'] == 'charles'
+    assert recipe['ingredients'] == []
+    assert recipe['steps'] == []
+
+def test_create_recipe_with_children(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'charles')
+    # warm the token cache so only the create itself is counted
+    test_app.delete("/api/recipes/9999", headers=headers)
+    recipe_data = {
+        "title": "Pancakes", "recipe_type": "breakfast", "cuisine_tags": "American", "serves": 4, "notes": "",
+        "ingredients": [{"name": "Flour", "quantity": "1 cup"}, {"name": "Milk", "quantity": "1 cup"}],
+        "steps": [{"step_order": 1, "step_details": "Whisk"}, {"step_order": 2, "step_details": "Fry"}],
+    }
+
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.post("/api/recipes", headers=headers, json=recipe_data)
+    assert response.status_code == 200
+    # Only inserts plus the tag lookup, no refresh or lazy loads to build the response
+    assert [statement for statement in statements if statement.startswith("SELECT")] == [
+        statement for statement in statements if statement.startswith("SELECT tags.")
+    ]
+
+    recipe = response.json()
+    assert recipe['user']['username'] == 'charles'
+    assert [ingredient['name'] for ingredient in recipe['ingredients']] == ["Flour", "Milk"]
+    assert [step['step_details'] for step in recipe['steps']] == ["Whisk", "Fry"]
+    assert all(step['recipe_id'] == recipe['id'] for step in recipe['steps'])
+
+    test_db.expire_all()
+    assert recipe == test_app.get(f"/api/recipes/{recipe['id']}").json()
+
+def test_search_recipes(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes/search?q=veal")
+    assert response.status_code == 200
+    assert [recipe['title'] for recipe in response.json()] == ["Veal Piccata"]
+
+def test_search_recipes_by_ingredient(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes/search?q=capers")
+    assert response.status_code == 200
+    assert [recipe['title'] for recipe in response.json()] == ["Veal Piccata"]
+
+def test_search_recipes_by_tag(test_app: TestClient, test_db: Session):
+    # Both recipes are tagged pasta
+    response = test_app.get("/api/recipes/search?q=pasta")
+    assert response.status_code == 200
+    assert {recipe['title'] for recipe in response.json()} == {"Veal Piccata", "Baked Mac and Cheese"}
+
+def test_search_sees_new_ingredients(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    test_app.post("/api/ingredients/bulk", headers=headers,
+                  json=[{"name": "Sharp cheddar", "quantity": "2 cups", "recipe_id": 2}])
+
+    response = test_app.get("/api/recipes/search?q=cheddar")
+    assert [recipe['title'] for recipe in response.json()] == ["Baked Mac and Cheese"]
+
+def test_search_recipes_paginated(test_app: TestClient, test_db: Session):
+    first = test_app.get("/api/recipes/search?q=pasta&limit=1&with_total=true")
+    assert first.headers['X-Total-Count'] == '2'
+    second = test_app.get("/api/recipes/search", params={"q": "pasta", "limit": 1, "cursor": first.headers['X-Next-Cursor']})
+    assert 'X-Next-Cursor' not in second.headers
+
+    titles = [recipe['title'] for recipe in first.json() + second.json()]
+    assert titles == [recipe['title'] for recipe in test_app.get("/api/recipes/search?q=pasta").json()]
+
+def test_search_cursor_rank_on_postgres(test_db: Session):
+    query, rank = search_recipes(test_db.query(RecipeModel), "postgresql", "pasta")
+    # the rank a cursor hands back is exactly the float it was given
+    after = decode_cursor(encode_cursor(2, 0.1 + 0.2))
+    assert after["rank"] == 0.1 + 0.2
+
+    statement = Page(Response(), 1, after, False).ranked(query, rank, RecipeModel.id).statement
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    # ts_rank and similarity are float4, every use of the rank (the column, both cursor
+    # comparisons and the ORDER BY) is widened to float8 like the cursor's parameter
+    assert sql.count("AS FLOAT(53))") == 4
+    assert "CAST(ts_rank(" in sql
+
+def test_search_recipes_query_syntax_is_escaped(test_app: TestClient, test_db: Session):
+    response = test_app.get('/api/recipes/search', params={"q": 'veal" OR NOT *'})
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_search_recipes_requires_query(test_app: TestClient, test_db: Session):
+    assert test_app.get("/api/recipes/search").status_code == 422
+    assert test_app.get("/api/recipes/search?q=%20").json() == []
@@ -0,0 +1,154 @@
+# tests/test_redis_cache.py
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.ingredient import IngredientModel
+
+fakeredis = pytest.importorskip("fakeredis")
+from cache.redis_cache import RedisCache
+from cache.recipes import call_cache, evict_recipes
+
+
+@pytest.fixture
+def workers():
+    # Two workers' caches on the same Redis
+    server = fakeredis.FakeServer()
+    caches = [RedisCache(fakeredis.FakeRedis(server=server), prefix="recipes:", ttl=60) for _ in range(2)]
+    yield caches
+    for cache in caches:
+        cache.close()
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_shared_between_workers(workers):
+    first, second = workers
+    first.set(1, ("{}", (1, 2)))
+
+    assert second.get(1) == ("{}", (1, 2))
+    assert second.get(2) is None
+    assert second.stats() == {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_delete_is_published(workers):
+    first, second = workers
+    first.set(1, "old")
+    assert second.get(1) == "old"
+    assert len(second) == 1
+
+    # the second worker's local copy goes too, not just the shared one
+    first.delete(1)
+    assert wait_for(lambda: len(second) == 0)
+    assert second.get(1) is None
+
+def test_clear_is_published(workers):
+    first, second = workers
+    first.set(1, "one")
+    first.set(2, "two")
+    second.get(1)
+
+    first.clear()
+    assert wait_for(lambda: len(second) == 0)
+    assert second.get(2) is None
+
+def test_expiry(workers):
+    first, second = workers
+    first.set(1, "soon", expires_at=time.time() + 0.05)
+    assert second.get(1) == "soon"
+
+    time.sleep(0.1)
+    assert first.get(1) is None
+    assert second.get(1) is None
+
+def test_redis_down():
+    server = fakeredis.FakeServer()
+    cache = RedisCache(fakeredis.FakeRedis(server=server), prefix="recipes:", ttl=60)
+    server.connected = False
+
+    # reads fall back to a miss and writes are dropped, nothing raises
+    cache.set(1, "value")
+    assert cache.get(1) is None
+    cache.delete(1)
+    cache.clear()
+    cache.close()
+
+def test_redis_down_at_startup():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    other = RedisCache(fakeredis.FakeRedis(server=server), prefix="recipes:", ttl=60)
+    cache = RedisCache(fakeredis.FakeRedis(server=server), prefix="recipes:", ttl=60)
+    assert cache.get(1) is None
+
+    # the listeners subscribe once Redis is back, and invalidations reach them again
+    server.connected = True
+    assert wait_for(lambda: cache._pubsub is not None and other._pubsub is not None, timeout=5)
+    other.set(1, "value")
+    assert cache.get(1) == "value"
+    other.delete(1)
+    assert wait_for(lambda: len(cache) == 0)
+    cache.close()
+    other.close()
+
+def test_unreachable_redis_url(monkeypatch):
+    from cache import recipes
+    monkeypatch.setattr(recipes, "cache_backend", "redis")
+    monkeypatch.setattr(recipes, "redis_url", "redis://localhost:1/0")
+
+    # the app still starts, every lookup is a miss
+    cache = recipes.make_recipe_cache()
+    assert cache.get(1) is None
+    cache.close()
+
+def test_async_calls_leave_the_event_loop(workers, monkeypatch):
+    first, _ = workers
+    monkeypatch.setattr("cache.recipes.recipe_cache", first)
+    # get and delete both talk to Redis through a pipeline
+    threads = []
+    pipeline = first.client.pipeline
+    monkeypatch.setattr(first.client, "pipeline", lambda: threads.append(threading.get_ident()) or pipeline())
+
+    async def requests():
+        await call_cache(first.get, 1)
+        evict_recipes([1])
+        assert await asyncio.to_thread(wait_for, lambda: len(threads) == 2)
+        return threading.get_ident()
+
+    # neither the lookup nor the eviction ran on the event loop's thread
+    loop_thread = asyncio.run(requests())
+    assert loop_thread not in threads
+
+def test_recipe_endpoint(workers, monkeypatch, test_app: TestClient, override_get_db, test_db: Session):
+    first, second = workers
+    # the app runs on the first worker's cache
+    monkeypatch.setattr("cache.recipes.recipe_cache", first)
+    monkeypatch.setattr("controllers.recipes.recipe_cache", first)
+
+    recipe = test_app.get("/api/recipes/1").json()
+    assert second.get(1) is not None
+    assert test_app.get("/api/recipes/1").headers['x-cache'] == "HIT"
+
+    test_db.add(IngredientModel(name="Capers", quantity="1 tbsp", recipe_id=1))
+    test_db.commit()
+    assert wait_for(lambda: len(second) == 0)
+    assert len(test_app.get("/api/recipes/1").json()['ingredients']) == len(recipe['ingredients']) + 1
+
+def test_values_are_json(workers):
+    first, second = workers
+    state = (datetime(2024, 5, 1, 12, 30, 15, 250), 3, None, 0)
+    first.set(1, ('{"id": 1}', state))
+
+    # stored as plain JSON, never pickled
+    assert orjson.loads(first.client.get("recipes:1")) == {"__tuple__": [
+        '{"id": 1}', {"__tuple__": [{"__datetime__": "2024-05-01T12:30:15.000250"}, 3, None, 0]}]}
+    assert second.get(1) == ('{"id": 1}', state)
@@ -0,0 +1,28 @@
+# tests/test_schema.py
+
+from sqlalchemy import inspect
+import main  # noqa: F401 - makes sure every model is imported and mapped
+from models.base import Base
+
+
+def leading_columns(columns, count):
+    return [column.name for column in list(columns)[:count]]
+
+def test_every_foreign_key_has_an_index():
+    # A foreign key without an index whose leading columns are the key turns every
+    # "children of X" lookup and every cascading delete into a full table scan
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        candidates = [index.columns for index in table.indexes] + [table.primary_key.columns]
+        for foreign_key in table.foreign_key_constraints:
+            key = [column.name for column in foreign_key.columns]
+            if not any(leading_columns(columns, len(key)) == key for columns in candidates):
+                missing.append(f"{table.name}({', '.join(key)})")
+    assert missing == []
+
+def test_indexes_exist_in_database(test_db):
+    inspector = inspect(test_db.get_bind())
+    steps_indexes = {index['name']: index['column_names'] for index in inspector.get_indexes("steps")}
+    assert steps_indexes["ix_steps_recipe_id_step_order"] == ["recipe_id", "step_order"]
+    assert ["recipe_id"] in [index['column_names'] for index in inspector.get_indexes("ingredients")]
+    assert ["user_id"] in [index['column_names'] for index in inspector.get_indexes("recipes")]
@@ -0,0 +1,93 @@
+# tests/test_slow_queries.py
+
+import json
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from cache.recipes import recipe_cache
+from models.slow_queries import SlowQueryLog
+
+
+@pytest.fixture
+def slow_queries(test_db: Session, caplog):
+    # Attaches a SlowQueryLog to the test engine, returns what it logged
+    engine = test_db.get_bind()
+    attached = []
+    logger = logging.getLogger("slow_queries")
+    logger.addHandler(caplog.handler)
+
+    def attach(**options):
+        log = SlowQueryLog(**options)
+        log.attach(engine)
+        attached.append(log)
+        # a fresh connection, so the listeners see every statement
+        test_db.commit()
+        return lambda: [json.loads(record.getMessage()) for record in caplog.records if record.name == "slow_queries"]
+
+    yield attach
+    for log in attached:
+        log.detach(engine)
+    logger.removeHandler(caplog.handler)
+
+
+def test_logs_statement_route_and_plan(test_app: TestClient, override_get_db, slow_queries):
+    recipe_cache.clear()
+    records = slow_queries(threshold_ms=0)
+
+    response = test_app.get("/api/recipes/1")
+    assert response.status_code == 200
+
+    logged = records()
+    assert logged
+    assert all(record['method'] == "GET" and record['route'] == "/api/recipes/{recipe_id}" for record in logged)
+    assert all(record['duration_ms'] >= 0 for record in logged)
+
+    # the ingredients are loaded through the recipe_id index, not a scan
+    ingredients = next(record for record in logged if record['statement'].startswith("SELECT ingredients."))
+    assert ingredients['parameters'] == [1]
+    assert any("ix_ingredients_recipe_id" in step for step in ingredients['plan'])
+
+def test_threshold(test_db: Session, slow_queries):
+    records = slow_queries(threshold_ms=60_000)
+    test_db.execute(text("SELECT 1"))
+    assert records() == []
+
+def test_sampling(test_db: Session, slow_queries):
+    records = slow_queries(threshold_ms=0, sample_rate=0)
+    test_db.execute(text("SELECT 1"))
+    assert records() == []
+
+def test_outside_a_request(test_db: Session, slow_queries):
+    records = slow_queries(threshold_ms=0, explain_analyze=True)
+    test_db.execute(text("SELECT count(*) FROM recipes WHERE serves > :serves"), {"serves": 2})
+
+    record = records()[-1]
+    assert record['route'] is None
+    assert record['parameters'] == [2]
+    assert record['plan']
+
+def test_executemany_not_explained(test_db: Session, slow_queries):
+    records = slow_queries(threshold_ms=0)
+    test_db.execute(text("UPDATE recipes SET serves = serves WHERE id = :id"), [{"id": 9998}, {"id": 9999}])
+    test_db.rollback()
+
+    record = next(record for record in records() if record['statement'].startswith("UPDATE"))
+    assert record['executemany'] is True
+    assert record['plan'] is None
+
+def test_savepoints_not_explained(test_db: Session, slow_queries):
+    records = slow_queries(threshold_ms=0)
+    # the first statement after a commit opens test_db's next SAVEPOINT
+    test_db.execute(text("SELECT 1"))
+
+    savepoint = next(record for record in records() if record['statement'].startswith("SAVEPOINT"))
+    assert savepoint['plan'] is None
+    assert not any(str(record['plan']).startswith("EXPLAIN failed") for record in records())
+
+def test_failed_explain(test_db: Session, slow_queries):
+    log = SlowQueryLog(threshold_ms=0)
+    connection = test_db.connection()
+    # reported in the record rather than raised into the request
+    assert log.explain(connection, "SELECT * FROM no_such_table", ()).startswith("EXPLAIN failed:")
@@ -0,0 +1,91 @@
+# tests/test_steps.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.step import StepModel
+from tests.lib import login, count_queries
+
+
+def test_move_step(test_app: TestClient, override_get_db, test_db: Session):
+    headers = login(test_app, 'nick123')
+
+    test_db.commit()
+    with count_queries(test_db.get_bind()) as statements:
+        response = test_app.put("/api/steps/8/move", headers=headers, json={"step_order": 2})
+    assert response.status_code == 200
+
+    # step 8 lands in second place, the steps it jumped over each move down one
+    steps = response.json()
+    assert [step['id'] for step in steps] == [1, 8, 2, 3, 4, 5, 6, 7, 9, 10]
+    assert [step['step_order'] for step in steps] == list(range(1, 11))
+    # the whole renumbering is a single statement
+    assert len([statement for statement in statements if statement.startswith("UPDATE")]) == 1
+
+    response = test_app.put("/api/steps/8/move", headers=headers, json={"step_order": 9})
+    assert [step['id'] for step in response.json()] == [1, 2, 3, 4, 5, 6, 7, 9, 8, 10]
+
+def test_move_step_out_of_range(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+
+    # past the end lands in last place, without leaving a gap
+    response = test_app.put("/api/steps/3/move", headers=headers, json={"step_order": 99})
+    assert response.status_code == 200
+    steps = response.json()
+    assert [step['id'] for step in steps] == [1, 2, 4, 5, 6, 7, 8, 9, 10, 3]
+    assert [step['step_order'] for step in steps] == list(range(1, 11))
+
+    # already last, nothing moves
+    response = test_app.put("/api/steps/3/move", headers=headers, json={"step_order": 11})
+    assert [step['step_order'] for step in response.json()] == list(range(1, 11))
+
+    response = test_app.put("/api/steps/3/move", headers=headers, json={"step_order": -1})
+    assert response.status_code == 422
+
+def add_steps(test_db: Session, orders):
+    steps = [StepModel(step_order=order, step_details=f"Step {order}", recipe_id=2) for order in orders]
+    test_db.add_all(steps)
+    test_db.commit()
+    return [step.id for step in steps]
+
+def test_move_step_sparse_orders(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    first, second, third = add_steps(test_db, (10, 20, 30))
+
+    # past the end is still last, and the steps are renumbered 1..n
+    response = test_app.put(f"/api/steps/{third}/move", headers=headers, json={"step_order": 50})
+    assert [step['id'] for step in response.json()] == [first, second, third]
+
+    response = test_app.put(f"/api/steps/{first}/move", headers=headers, json={"step_order": 2})
+    steps = response.json()
+    assert [step['id'] for step in steps] == [second, first, third]
+    assert [step['step_order'] for step in steps] == [1, 2, 3]
+
+def test_move_step_duplicate_orders(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    first, second, third = add_steps(test_db, (1, 1, 2))
+
+    response = test_app.put(f"/api/steps/{third}/move", headers=headers, json={"step_order": 1})
+    steps = response.json()
+    assert [step['id'] for step in steps] == [third, first, second]
+    assert [step['step_order'] for step in steps] == [1, 2, 3]
+
+def test_move_step_restricted(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'charles')
+    response = test_app.put("/api/steps/1/move", headers=headers, json={"step_order": 3})
+    assert response.status_code == 403
+
+def test_move_step_not_found(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    response = test_app.put("/api/steps/9999/move", headers=headers, json={"step_order": 1})
+    assert response.status_code == 404
+
+    response = test_app.put("/api/steps/1/move", headers=headers, json={"step_order": 0})
+    assert response.status_code == 422
+
+def test_recipe_steps_in_order(test_app: TestClient, test_db: Session):
+    test_db.add_all(StepModel(step_order=order, step_details=f"Step {order}", recipe_id=2) for order in (3, 1, 2))
+    test_db.commit()
+
+    response = test_app.get("/api/recipes/2")
+    assert response.status_code == 200
+    assert [step['step_order'] for step in response.json()['steps']] == [1, 2, 3]
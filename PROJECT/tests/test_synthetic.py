@@ -0,0 +1,73 @@
+# tests/test_synthetic.py
+
+from collections import Counter
+from itertools import islice
+from sqlalchemy import create_engine, func, select
+from models.base import Base
+from models.recipe import RecipeModel
+from models.ingredient import IngredientModel
+from models.step import StepModel
+from models.tag import recipe_tags
+from models.user import UserModel
+from models import search
+from data.loader import load, load_tags
+from data.synthetic import Catalogue, parse_scale
+
+
+def test_parse_scale():
+    assert parse_scale("250") == 250
+    assert parse_scale("1k") == 1_000
+    assert parse_scale("100K") == 100_000
+    assert parse_scale("1.5m") == 1_500_000
+    assert parse_scale("10_000") == 10_000
+
+def test_same_seed_same_rows():
+    first, second, other = Catalogue(200, seed=1), Catalogue(200, seed=1), Catalogue(200, seed=2)
+    assert list(first.recipe_rows()) == list(second.recipe_rows())
+    assert list(first.step_rows()) == list(second.step_rows())
+    assert list(first.ingredient_rows()) != list(other.ingredient_rows())
+
+    # each table has its own stream, a bigger catalogue starts with the same recipes
+    assert list(islice(Catalogue(1_000, seed=1, users=20).recipe_rows(), 200)) == \
+        list(Catalogue(200, seed=1, users=20).recipe_rows())
+
+def test_distributions():
+    catalogue = Catalogue(5_000, seed=3)
+    recipes = list(catalogue.recipe_rows())
+    assert len({recipe['title'] for recipe in recipes}) == 5_000
+    assert all(1 <= recipe['user_id'] <= catalogue.users for recipe in recipes)
+
+    # a few users own a lot, far above the 10 recipes per user average
+    owners = Counter(recipe['user_id'] for recipe in recipes)
+    assert owners.most_common(1)[0][1] > 100
+
+    ingredients = Counter(row['recipe_id'] for row in catalogue.ingredient_rows())
+    steps = Counter(row['recipe_id'] for row in catalogue.step_rows())
+    assert len(ingredients) == len(steps) == 5_000
+    assert 6 < sum(ingredients.values()) / 5_000 < 10
+    assert 5 < sum(steps.values()) / 5_000 < 8
+    assert max(steps.values()) > 12
+
+    tags = Counter(tag for recipe in recipes for tag in recipe['cuisine_tags'].split(", "))
+    assert tags.most_common(1)[0][0] == "italian"
+    assert tags["italian"] > 10 * tags["meal prep"]
+
+def test_streams_into_loader(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/synthetic.db")
+    Base.metadata.create_all(bind=engine)
+    catalogue = Catalogue(300, seed=5)
+    for _ in range(2):
+        with engine.begin() as connection:
+            load(connection, UserModel, catalogue.user_rows(), key=["id"], batch_size=100)
+            load(connection, RecipeModel, catalogue.recipe_rows(), key=["id"], batch_size=100)
+            load(connection, IngredientModel, catalogue.ingredient_rows(), key=["id"], batch_size=100)
+            load(connection, StepModel, catalogue.step_rows(), key=["id"], batch_size=100)
+            load_tags(connection, batch_size=100)
+
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(RecipeModel)).scalar() == 300
+        assert connection.execute(select(func.count()).select_from(StepModel)).scalar() == \
+            sum(1 for _ in catalogue.step_rows())
+        assert connection.execute(select(func.count()).select_from(recipe_tags)).scalar() == \
+            sum(len(recipe['cuisine_tags'].split(", ")) for recipe in catalogue.recipe_rows())
+    engine.dispose()
@@ -0,0 +1,60 @@
+# tests/test_tags.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from models.tag import TagModel, insert_tag_names, split_tags
+from tests.lib import login
+
+
+def test_split_tags():
+    assert split_tags("Italian, veal, pasta") == ["italian", "veal", "pasta"]
+    assert split_tags(" Pasta ,pasta,, ") == ["pasta"]
+    assert split_tags(None) == []
+
+def test_insert_tag_names_skips_existing(test_db: Session):
+    # "pasta" is already there, as if another request had just created it
+    insert_tag_names(test_db, {"pasta", "brunch"})
+    insert_tag_names(test_db, {"brunch"})
+    names = sorted(tag.name for tag in test_db.query(TagModel))
+    assert names == ["brunch", "italian", "pasta", "veal"]
+
+def test_seeded_recipes_are_tagged(test_app: TestClient, override_get_db, test_db: Session):
+    names = sorted(tag.name for tag in test_db.query(TagModel))
+    assert names == ["italian", "pasta", "veal"]
+
+def test_get_tags(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/tags")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "pasta", "count": 2},
+        {"name": "italian", "count": 1},
+        {"name": "veal", "count": 1},
+    ]
+
+def test_filter_recipes_by_tag(test_app: TestClient, test_db: Session):
+    response = test_app.get("/api/recipes?tag=Italian")
+    assert response.status_code == 200
+    assert [recipe['title'] for recipe in response.json()] == ["Veal Piccata"]
+
+    response = test_app.get("/api/recipes?tag=pasta")
+    assert [recipe['title'] for recipe in response.json()] == ["Veal Piccata", "Baked Mac and Cheese"]
+
+    response = test_app.get("/api/recipes?tag=dessert")
+    assert response.json() == []
+
+def test_tags_follow_cuisine_tags(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    recipe = test_app.get("/api/recipes/2").json()
+
+    response = test_app.put("/api/recipes/2", headers=headers, json=dict(recipe, cuisine_tags="pasta, comfort food"))
+    assert response.status_code == 200
+
+    assert [recipe['id'] for recipe in test_app.get("/api/recipes?tag=comfort food").json()] == [2]
+    assert {"name": "comfort food", "count": 1} in test_app.get("/api/tags").json()
+
+def test_deleting_recipe_drops_its_tags(test_app: TestClient, test_db: Session):
+    headers = login(test_app, 'nick123')
+    test_app.delete("/api/recipes/2", headers=headers)
+
+    assert test_app.get("/api/recipes?tag=comfort food").json() == []
+    assert {"name": "pasta", "count": 1} in test_app.get("/api/tags").json()